@@ -59,6 +59,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'monitor.context_processors.unread_notifications',
             ],
         },
     },
@@ -155,3 +156,38 @@ REST_FRAMEWORK = {
 }
 
 
+
+# Competitor Monitoring
+MONITOR_MAX_WORKERS = 8  # Concurrent website fetches per monitoring run
+MONITOR_MAX_PER_HOST = 2  # Concurrent fetches against any single host
+MONITOR_PARSE_WORKERS = 0  # Processes for parsing/classifying pages; 0 parses in the fetch threads
+MONITOR_HOST_RATE = 1.0  # Sustained requests per second to any single host
+MONITOR_HOST_BURST = 2  # Requests a host may receive back to back before throttling
+MONITOR_RESPECT_ROBOTS = True
+MONITOR_ROBOTS_TTL = 3600  # Seconds to cache each host's robots.txt
+MONITOR_BREAKER_THRESHOLD = 3  # Consecutive failures before a competitor's circuit opens
+MONITOR_BACKOFF_BASE_MINUTES = 30  # First backoff once open; doubles with each further failure
+MONITOR_BACKOFF_MAX_HOURS = 24
+MONITOR_FEED_MAX_ITEMS = 20  # Newest new entries ingested from a feed or sitemap per run
+MONITOR_FEED_DISCOVERY_DAYS = 7  # Days between searches for a competitor's feeds and sitemaps
+MONITOR_MAX_PAGE_BYTES = 2 * 1024 * 1024  # Bodies are read up to this size; the rest is ignored
+MONITOR_ALLOWED_CONTENT_TYPES = [
+    'text/html', 'application/xhtml+xml', 'text/xml', 'application/xml',
+    'application/rss+xml', 'application/atom+xml', 'application/rdf+xml',
+]
+MONITOR_PERSIST_CHUNK_SIZE = 500  # Rows written per transaction when saving a monitoring run
+MONITOR_NOTIFY_RECIPIENTS = 'all'  # Who gets high-impact notifications: 'all', 'active' or 'subscribed' users
+MONITOR_NOTIFICATION_CHUNK_SIZE = 1000  # Notifications inserted per bulk_create
+MONITOR_NOTIFICATION_DIGEST_MINUTES = 0  # Minutes per window when grouping each user's high-impact updates into one digest; 0 sends one notification per update
+MONITOR_NOTIFICATION_BROKER = 'monitor.pubsub.InProcessBroker'  # Dotted path of the broker behind /notifications/stream/
+MONITOR_LIVE_NOTIFICATIONS = None  # Pages open the notification stream: True, False, or None to do so only when served over ASGI
+MONITOR_STREAM_HEARTBEAT_SECONDS = 20  # Keep-alive interval of idle notification streams
+MONITOR_STREAM_QUEUE_SIZE = 100  # Undelivered messages a stream may fall behind before it is asked to reconnect
+MONITOR_RETENTION_READ_NOTIFICATION_DAYS = 30  # Read notifications older than this are deleted by `manage.py retention`; 0 keeps them
+MONITOR_RETENTION_ARCHIVE_UPDATE_MONTHS = 12  # Updates older than this are moved to ArchivedUpdate; 0 keeps them
+MONITOR_RETENTION_CHUNK_SIZE = 500  # Rows reclaimed per transaction by the retention job
+MONITOR_SPIKE_DETECTION = True  # Look for statistical spikes in update activity after every monitoring run
+MONITOR_SPIKE_WINDOW_DAYS = 1  # Recent days compared against the baseline
+MONITOR_SPIKE_BASELINE_DAYS = 28  # Days of history the expected activity is estimated from
+MONITOR_SPIKE_SIGNIFICANCE = 0.01  # Largest corrected p-value reported as a spike
+MONITOR_SPIKE_MAX_TRENDS = 20  # Most significant spikes recorded as trends per run
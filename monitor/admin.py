@@ -1,16 +1,61 @@
 from django.contrib import admin
-from .models import Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig
+from django.db import transaction
+from .models import (
+    Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig, FetchState, ExtractionRule,
+    PageSnapshot, FeedSource, UnreadNotificationCounter, ArchivedUpdate,
+    BreakerState
+)
+
+
+class NotificationCleanupMixin:
+    """
+    Repairs what an admin delete does to notifications it doesn't delete itself.
+
+    Digests led by deleted updates are led by another of their updates, and
+    users who lose unread notifications get their counters recounted.
+    update_lookup and notification_lookup filter updates and notifications
+    by the deleted rows, so both are read with one query before the delete.
+    """
+    update_lookup = None
+    notification_lookup = None
+    
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            user_ids = self.prepare_delete(type(obj).objects.filter(pk=obj.pk))
+            super().delete_model(request, obj)
+            if user_ids:
+                UnreadNotificationCounter.recount(user_ids)
+    
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            user_ids = self.prepare_delete(queryset)
+            super().delete_queryset(request, queryset)
+            if user_ids:
+                UnreadNotificationCounter.recount(user_ids)
+    
+    def prepare_delete(self, queryset):
+        """Re-point digests led by updates about to be deleted and return the users to recount afterwards"""
+        pks = queryset.values('pk')
+        if self.update_lookup:
+            Notification.relead_digests(CompetitorUpdate.objects.filter(**{self.update_lookup: pks}))
+        notifications = Notification.objects.filter(**{self.notification_lookup: pks})
+        return UnreadNotificationCounter.unread_user_ids(notifications)
 
 
 @admin.register(Competitor)
-class CompetitorAdmin(admin.ModelAdmin):
+class CompetitorAdmin(NotificationCleanupMixin, admin.ModelAdmin):
+    update_lookup = 'competitor__in'
+    notification_lookup = 'update__competitor__in'
     list_display = ['name', 'website', 'industry', 'is_active', 'created_at']
     list_filter = ['is_active', 'industry', 'created_at']
     search_fields = ['name', 'website', 'description']
+    filter_horizontal = ['subscribers']
 
 
 @admin.register(CompetitorUpdate)
-class CompetitorUpdateAdmin(admin.ModelAdmin):
+class CompetitorUpdateAdmin(NotificationCleanupMixin, admin.ModelAdmin):
+    update_lookup = 'pk__in'
+    notification_lookup = 'update__in'
     list_display = ['title', 'competitor', 'update_type', 'impact_score', 'is_high_impact', 'detected_at']
     list_filter = ['update_type', 'is_high_impact', 'detected_at', 'source']
     search_fields = ['title', 'content', 'competitor__name']
@@ -25,15 +70,72 @@ class TrendAdmin(admin.ModelAdmin):
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
-    list_display = ['user', 'update', 'is_read', 'created_at']
-    list_filter = ['is_read', 'created_at']
+class NotificationAdmin(NotificationCleanupMixin, admin.ModelAdmin):
+    notification_lookup = 'pk__in'
+    list_display = ['user', 'update', 'is_digest', 'is_read', 'created_at']
+    list_filter = ['is_read', 'is_digest', 'created_at']
     search_fields = ['user__username', 'message']
 
 
+@admin.register(UnreadNotificationCounter)
+class UnreadNotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ['user', 'count']
+    search_fields = ['user__username']
+    readonly_fields = ['user', 'count']
+
+
 @admin.register(MonitoringConfig)
 class MonitoringConfigAdmin(admin.ModelAdmin):
-    list_display = ['competitor', 'check_interval_hours', 'is_enabled', 'last_checked']
+    list_display = ['competitor', 'check_interval_hours', 'is_enabled', 'last_checked',
+                    'breaker_state', 'consecutive_failures', 'avg_latency_ms', 'backoff_until']
+    list_filter = ['is_enabled', 'breaker_state']
+    readonly_fields = ['breaker_state', 'consecutive_failures', 'last_failure_at', 'last_error',
+                       'backoff_until', 'avg_latency_ms', 'feeds_discovered_at']
+    actions = ['reset_breaker']
+    
+    @admin.action(description='Reset circuit breaker')
+    def reset_breaker(self, request, queryset):
+        queryset.update(breaker_state=BreakerState.CLOSED, consecutive_failures=0, backoff_until=None)
+
+
+@admin.register(ExtractionRule)
+class ExtractionRuleAdmin(admin.ModelAdmin):
+    list_display = ['competitor', 'item_selector', 'max_items', 'is_enabled', 'updated_at']
     list_filter = ['is_enabled']
+    search_fields = ['competitor__name', 'item_selector']
+
+
+@admin.register(FetchState)
+class FetchStateAdmin(admin.ModelAdmin):
+    list_display = ['url', 'last_status', 'etag', 'last_modified', 'fetched_at', 'changed_at']
+    search_fields = ['url']
+    readonly_fields = ['etag', 'last_modified', 'content_hash', 'last_status', 'fetched_at', 'changed_at']
+
+
+@admin.register(PageSnapshot)
+class PageSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['content_hash', 'url', 'size', 'truncated', 'created_at']
+    list_filter = ['truncated']
+    search_fields = ['url', 'content_hash']
+    exclude = ['data']
+    readonly_fields = ['content_hash', 'url', 'size', 'truncated', 'created_at']
+
+
+@admin.register(FeedSource)
+class FeedSourceAdmin(admin.ModelAdmin):
+    list_display = ['url', 'competitor', 'kind', 'is_verified', 'is_enabled', 'last_published']
+    list_filter = ['kind', 'is_verified', 'is_enabled']
+    search_fields = ['url', 'competitor__name']
+    readonly_fields = ['last_guid', 'last_published', 'created_at']
 
 
+@admin.register(ArchivedUpdate)
+class ArchivedUpdateAdmin(admin.ModelAdmin):
+    list_display = ['title', 'competitor', 'update_type', 'impact_score', 'detected_at', 'archived_at']
+    list_filter = ['update_type', 'is_high_impact', 'archived_at']
+    search_fields = ['title', 'competitor__name']
+    exclude = ['data']
+    readonly_fields = [
+        'id', 'competitor', 'title', 'url', 'update_type', 'impact_score', 'is_high_impact', 'source',
+        'detected_at', 'published_date', 'fingerprint', 'archived_at',
+    ]
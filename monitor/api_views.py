@@ -4,7 +4,9 @@ from rest_framework.response import Response
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
-from .models import Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig, UpdateType
+from .models import (
+    Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig, UpdateType, UnreadNotificationCounter
+)
 from .serializers import (
     CompetitorSerializer, CompetitorUpdateSerializer, TrendSerializer,
     NotificationSerializer, MonitoringConfigSerializer, DashboardStatsSerializer
@@ -76,7 +78,7 @@ class TrendViewSet(viewsets.ReadOnlyModelViewSet):
     def analyze(self, request):
         """Trigger trend analysis"""
         analyzer = TrendAnalyzer()
-        trends = analyzer.detect_trends()
+        trends = analyzer.detect_trends() + analyzer.detect_spikes()
         serializer = self.get_serializer(trends, many=True)
         return Response({
             'message': f'Trend analysis completed. Found {len(trends)} trends.',
@@ -93,9 +95,14 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         # Only return notifications for the authenticated user
         if self.request.user.is_authenticated:
-            return Notification.objects.filter(user=self.request.user)
+            return Notification.objects.filter(user=self.request.user).select_related('update__competitor')
         return Notification.objects.none()
     
+    def paginate_queryset(self, queryset):
+        # Load the updates of every digest on the page with one query
+        page = super().paginate_queryset(queryset)
+        return Notification.attach_updates(page) if page is not None else None
+    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark a notification as read"""
@@ -108,9 +115,16 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'error': 'Permission denied'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        notification.is_read = True
-        notification.save()
+        notification.mark_read()
         return Response({'message': 'Notification marked as read'})
+    
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """Return the number of unread notifications"""
+        if not request.user.is_authenticated:
+            return Response({'error': 'Authentication required'}, 
+                          status=status.HTTP_401_UNAUTHORIZED)
+        return Response({'unread_count': UnreadNotificationCounter.count_for(request.user)})
 
 
 @api_view(['GET'])
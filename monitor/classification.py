@@ -0,0 +1,337 @@
+"""
+Keyword-based classification and impact scoring of competitor updates
+"""
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from .models import UpdateType
+
+# Keywords match whole words; a trailing * matches any word starting with the stem,
+# and a symbol such as $ only matches in front of an amount ("$49")
+CATEGORY_KEYWORDS = {
+    UpdateType.PRICING: ['price*', 'pricing', 'cost', 'costs', '$', 'discount*', 'sale', 'deal', 'deals',
+                         'offer*', 'promotion*'],
+    UpdateType.CAMPAIGN: ['campaign*', 'launch*', 'advertis*', 'marketing', 'promot*', 'announc*'],
+    UpdateType.RELEASE: ['release*', 'launch*', 'new product*', 'introducing', 'unveil*', 'debut*'],
+    UpdateType.PARTNERSHIP: ['partnership*', 'partner*', 'collaboration*', 'alliance*', 'joint'],
+    UpdateType.FEATURE: ['feature*', 'update*', 'improvement*', 'enhancement*', 'new functionality'],
+}
+
+# Earlier categories win when an update matches several
+CATEGORY_ORDER = [
+    UpdateType.PRICING,
+    UpdateType.CAMPAIGN,
+    UpdateType.RELEASE,
+    UpdateType.PARTNERSHIP,
+    UpdateType.FEATURE,
+]
+
+IMPACT = 'impact'
+IMPACT_KEYWORDS = ['launch*', 'new', 'breakthrough*', 'major', 'significant*', 'revolutionary']
+IMPACT_KEYWORD_SCORE = 10
+
+# Label of the keywords a competitor's MonitoringConfig asks to watch for
+WATCHED = 'watched'
+WATCHED_KEYWORD_SCORE = 10
+KEYWORD_MATCHER_CACHE_SIZE = 256
+
+TYPE_SCORES = {
+    UpdateType.PRICING: 30,
+    UpdateType.RELEASE: 40,
+    UpdateType.CAMPAIGN: 25,
+    UpdateType.PARTNERSHIP: 35,
+    UpdateType.FEATURE: 20,
+}
+DEFAULT_TYPE_SCORE = 10
+LONG_CONTENT_LENGTH = 500
+LONG_CONTENT_SCORE = 10
+
+
+# Parts of a whitespace-separated token that keywords are matched against
+TOKEN_PART_RE = re.compile(r'\w+|[^\w\s](?=\d)')
+WORD_CHAR_RE = re.compile(r'\w')
+WORD_RE = re.compile(r'\w+')
+NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+
+# Lowercases ASCII text and turns every ASCII character that is not a word character into a space
+ASCII_SPACES = ''.join(chr(code) if WORD_CHAR_RE.match(chr(code)) else ' ' for code in range(128)).lower()
+
+
+def keyword_pattern(keyword):
+    """
+    Return the regular expression for a lowercase keyword, without its leading word boundary.
+
+    The boundary before a keyword is checked separately by the caller: a
+    pattern that starts with a literal lets the regex engine skip straight
+    to candidate positions, which a leading look-behind would prevent.
+    """
+    stem = keyword.endswith('*')
+    word = keyword.rstrip('*')
+    pattern = r'\s+'.join(re.escape(part) for part in word.split())
+    
+    if stem:
+        pattern += r'\w*'
+    elif re.search(r'\w$', word):
+        pattern += r'(?!\w)'
+    else:
+        pattern += r'(?=\s?\d)'
+    return pattern
+
+
+def trie_pattern(keywords):
+    """
+    Return one regex alternation of (word, tail) pairs that shares their common prefixes.
+
+    Each word is followed by its tail pattern; where one word ends inside
+    another, both tails are tried, so shorter keywords still match.
+    """
+    tree = {}
+    for word, tail in keywords:
+        node = tree
+        for char in word:
+            node = node.setdefault(char, {})
+        node.setdefault('', set()).add(tail)
+    
+    def branch(node):
+        tails = sorted(node.get('', ()))
+        if r'\w*' in tails:
+            # A stem already matches every longer word
+            return r'\w*'
+        alternatives = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char] + tails
+        return alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    
+    return branch(tree)
+
+
+@lru_cache(maxsize=4096)
+def ascii_stand_in(run):
+    """Return a run of non-ASCII characters as '_' for word characters and ' ' for the rest"""
+    return ''.join('_' if WORD_CHAR_RE.match(char) else ' ' for char in run)
+
+
+def spaced_words(text):
+    """
+    Return lowercase text as ASCII with every non-word character turned into a space.
+
+    Non-ASCII word characters become '_', so words keep their boundaries and
+    never spell an ASCII keyword they didn't before.
+    """
+    if not text.isascii():
+        text = NON_ASCII_RE.sub(lambda match: ascii_stand_in(match.group()), text)
+    return text.translate(ASCII_SPACES)
+
+
+class KeywordMatcher:
+    """
+    Finds the keywords of several labelled keyword lists in one pass over a text.
+
+    Single-word keywords and stems are compiled into one alternation that
+    shares their common prefixes, and one findall() per text returns every
+    word starting with one of them. For ASCII keywords the text is first
+    translated so that every word boundary is a space; a pattern starting
+    with a literal space lets the regex engine jump between word starts
+    instead of testing a boundary at every character. Symbols such as $
+    and the rest of multi-word keywords are confirmed on the lowercase
+    text, but only when it contains them.
+    """
+    
+    max_words = 100000
+    
+    def __init__(self, keywords):
+        self.labels = {}
+        for label, label_keywords in keywords.items():
+            for keyword in label_keywords:
+                self.labels.setdefault(keyword.lower(), set()).add(label)
+        
+        self.words = {}
+        self.stems = {}
+        self.phrases = {}
+        self.symbols = {}
+        for keyword in self.labels:
+            if ' ' in keyword:
+                head = keyword.split()[0]
+                self.phrases.setdefault(head, []).append(
+                    (keyword, re.compile(keyword_pattern(keyword)), bool(WORD_CHAR_RE.match(keyword)))
+                )
+            elif keyword.endswith('*'):
+                self.stems[keyword.rstrip('*')] = keyword
+            else:
+                self.words[keyword] = keyword
+        self.stem_lengths = sorted({len(stem) for stem in self.stems})
+        
+        # Only runs of word characters, and single symbols in front of a digit, can match at all
+        for word, keyword in [*self.words.items(), *self.stems.items()]:
+            if len(word) == 1 and not WORD_CHAR_RE.match(word) and not word.isspace():
+                self.symbols[word] = re.compile(re.escape(word) + r'(?=\d)')
+        stems = [stem for stem in self.stems if WORD_RE.fullmatch(stem)]
+        words = [word for word in [*self.words, *self.phrases] if WORD_RE.fullmatch(word)]
+        pattern = trie_pattern([(stem, r'\w*') for stem in stems] + [(word, r'(?!\w)') for word in words])
+        
+        # Keywords with non-ASCII or '_' characters could be spelled by the stand-ins of spaced_words()
+        self.spaced = all(word.isascii() and '_' not in word for word in stems + words)
+        self.pattern = re.compile((' ' if self.spaced else r'\W') + (pattern or '(?!)'))
+        self.resolved = {}
+    
+    def clear(self):
+        """Forget the cached words"""
+        self.resolved = {}
+    
+    def keywords_in_token(self, token):
+        """Return the keywords, and heads of multi-word keywords, that a lowercase token contains"""
+        keywords = set()
+        heads = set()
+        for part in TOKEN_PART_RE.findall(token):
+            if part in self.words:
+                keywords.add(self.words[part])
+            for length in self.stem_lengths:
+                if length <= len(part) and part[:length] in self.stems:
+                    keywords.add(self.stems[part[:length]])
+            if part in self.phrases:
+                heads.add(part)
+        return tuple(keywords), tuple(heads)
+    
+    def match(self, text):
+        """Return a dict of label -> set of the distinct keywords of that label found in text"""
+        if self.spaced and text.isascii():
+            # Translating ASCII text also lowercases it; the lowercase text is only needed for phrases
+            words = self.pattern.findall(' ' + text.translate(ASCII_SPACES))
+            lowercase = None
+        else:
+            lowercase = text.lower()
+            words = self.pattern.findall(' ' + (spaced_words(lowercase) if self.spaced else lowercase))
+        
+        found = {}
+        heads = ()
+        resolved = self.resolved
+        for word in words:
+            keywords = resolved.get(word)
+            if keywords is None:
+                keywords = self.resolve(word)
+            for keyword in keywords[0]:
+                for label in self.labels[keyword]:
+                    found.setdefault(label, set()).add(keyword)
+            if keywords[1]:
+                heads += keywords[1]
+        
+        for symbol, pattern in self.symbols.items():
+            if symbol in text and pattern.search(text):
+                keyword = self.words.get(symbol) or self.stems[symbol]
+                for label in self.labels[keyword]:
+                    found.setdefault(label, set()).add(keyword)
+        
+        if heads:
+            lowercase = lowercase or text.lower()
+            for head in set(heads):
+                for phrase, pattern, bounded in self.phrases[head]:
+                    if self._search(pattern, lowercase, bounded):
+                        for label in self.labels[phrase]:
+                            found.setdefault(label, set()).add(phrase)
+        return found
+    
+    def resolve(self, word):
+        """Return and remember the keywords and phrase heads of a match, which starts with its boundary"""
+        keywords = self.keywords_in_token(word[1:])
+        if len(self.resolved) >= self.max_words:
+            self.resolved = {}
+        # Replacing or adding one entry is atomic, so concurrent matches need no lock
+        self.resolved[word] = keywords
+        return keywords
+    
+    def _search(self, pattern, text, bounded):
+        """Return True if pattern matches text at a position not preceded by a word character"""
+        match = pattern.search(text)
+        while match is not None:
+            start = match.start()
+            if not bounded or not start or not WORD_CHAR_RE.match(text, start - 1):
+                return True
+            match = pattern.search(text, start + 1)
+        return False
+
+
+@lru_cache(maxsize=None)
+def default_matcher():
+    """Return the process-wide matcher for the built-in category and impact keywords"""
+    return KeywordMatcher({**CATEGORY_KEYWORDS, IMPACT: IMPACT_KEYWORDS})
+
+
+def category_for(found):
+    """Return the update type of the first category with a keyword in found"""
+    for update_type in CATEGORY_ORDER:
+        if found.get(update_type):
+            return update_type
+    return UpdateType.OTHER
+
+
+def impact_score_for(found, content, update_type):
+    """Return the 0-100 impact score of an update from its matched keywords"""
+    score = IMPACT_KEYWORD_SCORE * len(found.get(IMPACT, ()))
+    score += TYPE_SCORES.get(update_type, DEFAULT_TYPE_SCORE)
+    
+    # Longer content might be more important
+    if len(content) > LONG_CONTENT_LENGTH:
+        score += LONG_CONTENT_SCORE
+    
+    return min(score, 100)
+
+
+def classify(title, content, matcher=None):
+    """Return (update_type, impact_score) for an update from a single keyword scan"""
+    found = (matcher or default_matcher()).match(f"{title} {content}")
+    update_type = category_for(found)
+    return update_type, impact_score_for(found, content, update_type)
+
+
+def parse_keywords(text):
+    """Split a comma-separated keyword list into distinct lowercase keywords"""
+    keywords = []
+    for keyword in (text or '').split(','):
+        keyword = ' '.join(keyword.split()).lower()
+        if keyword and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+
+# Process-level LRU cache of watched keyword matchers: (config id, version) -> KeywordMatcher or None
+_keyword_matchers = OrderedDict()
+_keyword_matchers_lock = threading.Lock()
+
+
+def get_keyword_matcher(config_id, keywords):
+    """
+    Return the matcher for a config's comma-separated keywords, or None if it has none.
+
+    The keyword text itself is the version, so a config edited in another
+    process is never matched with stale keywords; the model signal only
+    frees the old entry early.
+    """
+    key = (config_id, keywords or '')
+    with _keyword_matchers_lock:
+        if key in _keyword_matchers:
+            _keyword_matchers.move_to_end(key)
+            return _keyword_matchers[key]
+    
+    parsed = parse_keywords(keywords)
+    matcher = KeywordMatcher({WATCHED: parsed}) if parsed else None
+    with _keyword_matchers_lock:
+        _keyword_matchers[key] = matcher
+        while len(_keyword_matchers) > KEYWORD_MATCHER_CACHE_SIZE:
+            _keyword_matchers.popitem(last=False)
+    return matcher
+
+
+def invalidate_keyword_matcher(config_id):
+    """Drop every cached matcher of a config"""
+    with _keyword_matchers_lock:
+        for key in [key for key in _keyword_matchers if key[0] == config_id]:
+            del _keyword_matchers[key]
+
+
+def watched_keywords(matcher, title, content):
+    """Return the watched keywords found in an update"""
+    return matcher.match(f"{title} {content}").get(WATCHED, set())
+
+
+def boosted_score(impact_score, found):
+    """Return an impact score raised for the watched keywords an update mentions"""
+    return min(impact_score + WATCHED_KEYWORD_SCORE * len(found), 100)
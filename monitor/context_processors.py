@@ -0,0 +1,31 @@
+"""
+Template context shared by every page
+"""
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from .models import UnreadNotificationCounter
+
+
+def live_notifications_enabled(request):
+    """
+    Return True if pages should open the live notification stream.
+
+    Every open page holds a stream, which an ASGI server serves cheaply but
+    a WSGI server serves with a blocked worker thread each, so by default
+    the stream is only used when the page itself was served over ASGI.
+    """
+    enabled = getattr(settings, 'MONITOR_LIVE_NOTIFICATIONS', None)
+    if enabled is None:
+        return isinstance(request, ASGIRequest)
+    return bool(enabled)
+
+
+def unread_notifications(request):
+    """Expose the signed-in user's unread notification count for the navigation badge"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {
+        'unread_notification_count': UnreadNotificationCounter.count_for(user),
+        'live_notifications': live_notifications_enabled(request),
+    }
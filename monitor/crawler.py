@@ -0,0 +1,104 @@
+"""
+Concurrent crawl scheduling for competitor monitoring
+"""
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def host_for(url):
+    """Return the lowercase host name of a URL"""
+    return (urlsplit(url).hostname or '').lower()
+
+
+class CrawlScheduler:
+    """Runs fetch jobs on a bounded thread pool with per-host concurrency and rate limits"""
+    
+    def __init__(self, max_workers=8, max_per_host=2, rate_limiter=None):
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self.rate_limiter = rate_limiter
+    
+    def run(self, jobs, fetch, on_result=None):
+        """
+        Call fetch(job) for every job and return a dict of job['key'] -> result.
+
+        Each job is a dict with at least 'key' and 'url'. Jobs for the same host
+        never run more than max_per_host at a time, so a slow host only holds
+        its own slots while the remaining workers keep serving other hosts.
+        With a rate limiter, a host that is out of tokens keeps its jobs queued
+        until its bucket refills; jobs for other hosts are dispatched meanwhile.
+        Failed jobs are logged and reported as None. If given, on_result(job, result)
+        is called on the calling thread as each job finishes, so a later stage
+        can start on a result while other fetches are still running.
+        """
+        pending = defaultdict(deque)
+        for job in jobs:
+            pending[host_for(job['url'])].append(job)
+        
+        in_flight = defaultdict(int)
+        futures = {}
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as executor:
+            while pending or futures:
+                retry_in = self._dispatch(executor, pending, in_flight, futures, fetch)
+                
+                if not futures:
+                    # Every remaining host is throttled; sleep until the first bucket refills
+                    time.sleep(retry_in)
+                    continue
+                
+                done, _ = wait(futures, timeout=retry_in, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, job = futures.pop(future)
+                    in_flight[host] -= 1
+                    try:
+                        results[job['key']] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching {job['url']}: {str(e)}")
+                        results[job['key']] = None
+                    
+                    if on_result is not None:
+                        on_result(job, results[job['key']])
+        
+        return results
+    
+    def _dispatch(self, executor, pending, in_flight, futures, fetch):
+        """
+        Submit jobs round-robin across hosts until the pool or every host is saturated.
+
+        Returns the seconds until a throttled host can take another request, or
+        None if no host is waiting on its rate limit.
+        """
+        retry_in = None
+        throttled = set()
+        progress = True
+        while progress and len(futures) < self.max_workers:
+            progress = False
+            for host in list(pending):
+                if len(futures) >= self.max_workers:
+                    break
+                if in_flight[host] >= self.max_per_host or host in throttled:
+                    continue
+                
+                if self.rate_limiter is not None:
+                    wait_for = self.rate_limiter.try_acquire(host)
+                    if wait_for > 0:
+                        throttled.add(host)
+                        retry_in = wait_for if retry_in is None else min(retry_in, wait_for)
+                        continue
+                
+                job = pending[host].popleft()
+                if not pending[host]:
+                    del pending[host]
+                
+                futures[executor.submit(fetch, job)] = (host, job)
+                in_flight[host] += 1
+                progress = True
+        
+        return retry_in
@@ -0,0 +1,380 @@
+"""
+Streaming extraction of candidate updates from competitor pages
+"""
+import codecs
+import re
+from datetime import timezone as dt_timezone
+from urllib.parse import urljoin
+from dateutil import parser as date_parser
+from lxml import etree
+from lxml.cssselect import CSSSelector, SelectorError as CSSSelectorError
+from bs4.dammit import EncodingDetector
+
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4'])
+ARTICLE_TAGS = frozenset(['article', 'div'])
+ARTICLE_CLASS_RE = re.compile(r'post|article|news|update', re.I)
+XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# Strings inside these elements are not part of BeautifulSoup's get_text()
+SKIP_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+FEED_CHUNK_SIZE = 64 * 1024
+ENCODING_SNIFF_BYTES = 2048
+
+
+def element_text(element, separator=''):
+    """Return the element's text the way BeautifulSoup's get_text(strip=True) does"""
+    parts = []
+    stack = [(element, False)]
+    
+    while stack:
+        item, skip = stack.pop()
+        if isinstance(item, str):
+            text = item.strip()
+            if text:
+                parts.append(text)
+            continue
+        
+        # Comments and processing instructions only contribute their tails
+        if isinstance(item.tag, str):
+            skip = skip or item.tag in SKIP_TEXT_TAGS
+            if not skip and item.text:
+                text = item.text.strip()
+                if text:
+                    parts.append(text)
+        
+        for child in reversed(item):
+            if child.tail and not skip:
+                stack.append((child.tail, skip))
+            stack.append((child, skip))
+    
+    return separator.join(parts)
+
+
+class _IncrementalDecoder:
+    """Decodes a byte stream, sniffing the encoding from the first bytes like UnicodeDammit"""
+    
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+        self.decoder = None
+        self.buffer = b''
+    
+    def decode(self, data, final=False):
+        if self.decoder is None:
+            self.buffer += data
+            if len(self.buffer) < ENCODING_SNIFF_BYTES and not final:
+                return ''
+            data, self.buffer = self.buffer, b''
+            data = self._start(data)
+        return self.decoder.decode(data, final)
+    
+    def _start(self, head):
+        """Pick the decoder from the first bytes and return them without a byte order mark"""
+        encoding = self.encoding
+        if not encoding:
+            head, encoding = EncodingDetector.strip_byte_order_mark(head)
+            encoding = encoding or EncodingDetector.find_declared_encoding(head, is_html=True)
+        if not encoding:
+            # Undeclared pages are UTF-8 unless the first bytes prove otherwise
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(head)
+            except UnicodeDecodeError:
+                encoding = 'windows-1252'
+        try:
+            self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        return head
+
+
+class HeuristicExtractor:
+    """
+    Extracts heading and article candidates from HTML fed in chunks.
+
+    Produces the same candidates as running find_all over the headings and
+    post/article/news/update blocks of a full BeautifulSoup tree, but parses
+    with lxml's pull parser, frees elements as soon as they are no longer
+    needed, and stops as soon as the result can no longer change.
+    """
+    
+    def __init__(self, limit=5, max_headings=10, max_articles=10, min_length=20, encoding=None):
+        self.limit = limit
+        self.max_headings = max_headings
+        self.max_articles = max_articles
+        self.min_length = min_length
+        self.decoder = _IncrementalDecoder(encoding)
+        self.parser = etree.HTMLPullParser(
+            events=('start', 'end'), tag=list(HEADING_TAGS | ARTICLE_TAGS | SKIP_TEXT_TAGS)
+        )
+        # Candidates in document (start tag) order: [element, text]
+        self.headings = []
+        self.articles = []
+        self.open_candidates = {}
+        self.skip_depth = 0
+        self.done = False
+    
+    def feed(self, data):
+        """Feed a chunk of bytes or text; returns True once extraction is complete"""
+        if self.done:
+            return True
+        if isinstance(data, bytes):
+            data = self.decoder.decode(data)
+        if data:
+            self.parser.feed(data)
+            self._read_events()
+        return self.done
+    
+    def close(self):
+        """Finish parsing and return the extracted updates"""
+        if not self.done:
+            tail = self.decoder.decode(b'', final=True)
+            if tail:
+                self.parser.feed(tail)
+            try:
+                self.parser.close()
+            except etree.XMLSyntaxError:
+                # Empty or unparseable documents simply yield no candidates
+                pass
+            self._read_events()
+            self.done = True
+        return self.results()
+    
+    def results(self):
+        """Return the candidate texts that qualify as updates"""
+        texts = [text for _, text in self.headings[:self.max_headings] + self.articles[:self.max_articles]]
+        return [text for text in texts if text and len(text) > self.min_length][:self.limit]
+    
+    def _read_events(self):
+        for event, element in self.parser.read_events():
+            if event == 'start':
+                self._start(element)
+            else:
+                self._end(element)
+            if self.done:
+                return
+    
+    def _start(self, element):
+        if element.tag in SKIP_TEXT_TAGS:
+            self.skip_depth += 1
+            return
+        
+        if element.tag in HEADING_TAGS:
+            candidates, maximum = self.headings, self.max_headings
+        elif ARTICLE_CLASS_RE.search(element.get('class', '')):
+            candidates, maximum = self.articles, self.max_articles
+        else:
+            return
+        
+        if len(candidates) >= maximum:
+            return
+        
+        if self.skip_depth:
+            # Still counts towards the limit, but none of its strings are text
+            candidates.append([None, ''])
+            self.done = self._is_settled()
+        else:
+            record = [element, None]
+            candidates.append(record)
+            self.open_candidates[element] = record
+    
+    def _end(self, element):
+        if element.tag in SKIP_TEXT_TAGS:
+            self.skip_depth -= 1
+        
+        record = self.open_candidates.pop(element, None)
+        if record is not None:
+            record[1] = element_text(element)
+            record[0] = None
+            self.done = self._is_settled()
+        
+        # Nothing still open needs this subtree's text, so release it
+        if not self.open_candidates:
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+    
+    def _is_settled(self):
+        """True when no later element can change the result"""
+        found = self._count_settled(self.headings)
+        if found is None:
+            if len(self.headings) < self.max_headings:
+                return False
+            found = self._count_complete(self.headings)
+            if found is None:
+                return False
+        if found >= self.limit:
+            return True
+        
+        articles = self._count_settled(self.articles, self.limit - found)
+        if articles is not None:
+            return True
+        return len(self.articles) >= self.max_articles and self._count_complete(self.articles) is not None
+    
+    def _count_settled(self, candidates, needed=None):
+        """Return the number of qualifying texts if the leading finished candidates already supply enough"""
+        needed = self.limit if needed is None else needed
+        found = 0
+        for _, text in candidates:
+            if text is None:
+                return None
+            if len(text) > self.min_length:
+                found += 1
+                if found >= needed:
+                    return found
+        return None
+    
+    def _count_complete(self, candidates):
+        """Return the number of qualifying texts if every candidate has finished"""
+        if any(text is None for _, text in candidates):
+            return None
+        return sum(1 for _, text in candidates if len(text) > self.min_length)
+
+
+def extract_candidates(content, limit=5, chunk_size=FEED_CHUNK_SIZE):
+    """Return up to `limit` candidate update texts from an HTML document"""
+    extractor = HeuristicExtractor(limit=limit)
+    for start in range(0, len(content), chunk_size):
+        if extractor.feed(content[start:start + chunk_size]):
+            break
+    return extractor.close()
+
+
+def decode_html(content, encoding=None):
+    """Decode a whole HTML document using the same encoding sniffing as the streaming extractor"""
+    if isinstance(content, str):
+        return content
+    return _IncrementalDecoder(encoding).decode(content, final=True)
+
+
+def parse_html(content, encoding=None):
+    """Decode and parse a whole HTML document into an lxml tree; None if it is empty"""
+    text = decode_html(content, encoding)
+    # lxml rejects decoded text that still declares an encoding, as XHTML pages do
+    text = XML_DECLARATION_RE.sub('', text, count=1)
+    if not text.strip():
+        return None
+    return etree.HTML(text)
+
+
+class SelectorError(ValueError):
+    """Raised when an extraction rule contains a selector that cannot be compiled"""
+    
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+
+
+def compile_selector(selector, field='item_selector'):
+    """Compile a CSS selector, or an XPath expression starting with '/', './' or '(', into a callable"""
+    selector = selector.strip()
+    try:
+        if selector.startswith(('/', './', '../', '(')) or selector == '.':
+            return etree.XPath(selector)
+        return CSSSelector(selector)
+    except (CSSSelectorError, etree.XPathSyntaxError) as e:
+        raise SelectorError(field, f"Invalid selector '{selector}': {e}")
+
+
+class CompiledRule:
+    """The selectors of an ExtractionRule compiled once into reusable lxml selector objects"""
+    
+    def __init__(self, item_selector, title_selector='', content_selector='', link_selector='',
+                 date_selector='', max_items=5):
+        self.item = compile_selector(item_selector, 'item_selector')
+        self.title = compile_selector(title_selector, 'title_selector') if title_selector else None
+        self.content = compile_selector(content_selector, 'content_selector') if content_selector else None
+        self.link = compile_selector(link_selector, 'link_selector') if link_selector else None
+        self.date = compile_selector(date_selector, 'date_selector') if date_selector else None
+        self.max_items = max_items
+    
+    def extract(self, content, base_url):
+        """Return update dicts for the items matched in an HTML document"""
+        root = parse_html(content)
+        if root is None:
+            return []
+        
+        updates = []
+        for item in self.item(root):
+            if len(updates) >= self.max_items:
+                break
+            if not isinstance(item, etree._Element):
+                continue
+            
+            title = self._text(item, self.title)
+            if not title:
+                continue
+            
+            updates.append({
+                'title': title[:200],
+                'content': (self._text(item, self.content) or title)[:1000],
+                'url': self._link(item, base_url),
+                'published_date': self._date(item),
+            })
+        
+        return updates
+    
+    def _first(self, item, selector):
+        for match in selector(item):
+            if isinstance(match, etree._Element):
+                return match
+        return None
+    
+    def _text(self, item, selector):
+        element = item if selector is None else self._first(item, selector)
+        if element is None:
+            return ''
+        return ' '.join(element_text(element, separator=' ').split())
+    
+    def _link(self, item, base_url):
+        if self.link is not None:
+            element = self._first(item, self.link)
+        elif item.tag == 'a':
+            element = item
+        else:
+            element = next(item.iter('a'), None)
+        
+        href = element.get('href') if element is not None else None
+        return urljoin(base_url, href.strip()) if href else base_url
+    
+    def _date(self, item):
+        if self.date is None:
+            return None
+        element = self._first(item, self.date)
+        if element is None:
+            return None
+        
+        return parse_date(element.get('datetime') or element.get('content') or element_text(element, separator=' '))
+
+
+def parse_date(value):
+    """Parse a free-form date string into an aware datetime, assuming UTC; None if it isn't a date"""
+    if not value or not value.strip():
+        return None
+    try:
+        published = date_parser.parse(value, fuzzy=True)
+    except (ValueError, OverflowError):
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=dt_timezone.utc)
+    return published
+
+
+# Process-level cache of compiled rules: key -> (version, CompiledRule)
+_compiled_rules = {}
+
+
+def get_compiled_rule(key, version, **selectors):
+    """Return the compiled rule for key, compiling it only when its version has changed"""
+    cached = _compiled_rules.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    compiled = CompiledRule(**selectors)
+    _compiled_rules[key] = (version, compiled)
+    return compiled
+
+
+def invalidate_compiled_rule(key):
+    """Drop a compiled rule from the cache"""
+    _compiled_rules.pop(key, None)
@@ -37,11 +37,12 @@ class CompetitorForm(forms.ModelForm):
 class MonitoringConfigForm(forms.ModelForm):
     class Meta:
         model = MonitoringConfig
-        fields = ['check_interval_hours', 'is_enabled', 'keywords']
+        fields = ['check_interval_hours', 'is_enabled', 'keywords', 'near_duplicate_threshold']
         widgets = {
             'check_interval_hours': forms.NumberInput(attrs={'class': 'form-control', 'min': 1}),
             'is_enabled': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-            'keywords': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Comma-separated keywords'}),
+            'keywords': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Comma-separated keywords, e.g. pricing, new product, launch*'}),
+            'near_duplicate_threshold': forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 1, 'step': 0.01}),
         }
     
     def __init__(self, *args, **kwargs):
@@ -51,6 +52,7 @@ class MonitoringConfigForm(forms.ModelForm):
             'check_interval_hours',
             'is_enabled',
             'keywords',
+            'near_duplicate_threshold',
             Submit('submit', 'Save Configuration', css_class='btn btn-primary')
         )
 
@@ -0,0 +1,107 @@
+"""
+Micro-benchmark of how update classification scales with the number of keywords
+
+The substring cascade stops at the first keyword found anywhere inside a word
+("cost" in "costume"), so with the short built-in lists it is faster than the
+whole-word matcher. The matcher costs the same however many keywords it has;
+use --extra-keywords to compare them with longer lists.
+"""
+import random
+import time
+from django.core.management.base import BaseCommand
+from monitor.classification import (
+    CATEGORY_KEYWORDS, IMPACT, IMPACT_KEYWORDS, KeywordMatcher, classify, default_matcher
+)
+
+FILLER_WORDS = (
+    'the company today our customers team platform with for and across all of to in a is on that this '
+    'we are you your it by from at as be will can more than analytics dashboard integration mobile '
+    'enterprise cloud security report quarter growth news renewal costume newsletter data users '
+    'teams workflow support available region access plan annual performance insights results'
+).split()
+
+KEYWORD_WORDS = (
+    'price pricing discount sale deal offer promotion campaign launch launched advertising marketing '
+    'announce announces release introducing unveil debut partnership partner collaboration alliance '
+    'joint feature update improvement enhancement new breakthrough major significant revolutionary $49'
+).split()
+
+LEGACY_CATEGORIES = [
+    ('pricing', ['price', 'pricing', 'cost', '$', 'discount', 'sale', 'deal', 'offer', 'promotion']),
+    ('campaign', ['campaign', 'launch', 'advertising', 'marketing', 'promote', 'announce']),
+    ('release', ['release', 'launch', 'new product', 'introducing', 'unveil', 'debut']),
+    ('partnership', ['partnership', 'partner', 'collaboration', 'alliance', 'joint']),
+    ('feature', ['feature', 'update', 'improvement', 'enhancement', 'new functionality']),
+]
+LEGACY_IMPACT = ['launch', 'new', 'breakthrough', 'major', 'significant', 'revolutionary']
+
+
+def legacy_classify(title, content, categories=LEGACY_CATEGORIES, impact=LEGACY_IMPACT):
+    """The substring cascade the classifier replaced, kept as the benchmark baseline"""
+    text = (title + " " + content).lower()
+    update_type = 'other'
+    for candidate, keywords in categories:
+        if any(keyword in text for keyword in keywords):
+            update_type = candidate
+            break
+    
+    text = (title + " " + content).lower()
+    score = sum(10 for keyword in impact if keyword in text)
+    score += {'pricing': 30, 'release': 40, 'campaign': 25, 'partnership': 35, 'feature': 20}.get(update_type, 10)
+    if len(content) > 500:
+        score += 10
+    return update_type, min(score, 100)
+
+
+class Command(BaseCommand):
+    help = 'Compare classification cost with the substring cascade as keyword lists grow'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=20000, help='Number of synthetic updates')
+        parser.add_argument('--words', type=int, default=120, help='Words of content per update')
+        parser.add_argument('--keyword-ratio', type=float, default=0.05, help='Share of words that are keywords')
+        parser.add_argument('--extra-keywords', type=int, default=0,
+                            help='Synthetic keywords to add to every keyword list, to measure scaling')
+        parser.add_argument('--seed', type=int, default=0)
+    
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        
+        def text(words):
+            return ' '.join(
+                rng.choice(KEYWORD_WORDS) if rng.random() < options['keyword_ratio'] else rng.choice(FILLER_WORDS)
+                for _ in range(words)
+            )
+        
+        backlog = [(text(10), text(options['words'])) for _ in range(options['items'])]
+        megabytes = sum(len(title) + len(content) for title, content in backlog) / 1_000_000
+        
+        extra = [f'keyword{number}' for number in range(options['extra_keywords'])]
+        categories = [(candidate, keywords + extra) for candidate, keywords in LEGACY_CATEGORIES]
+        impact = LEGACY_IMPACT + extra
+        if extra:
+            matcher = KeywordMatcher({
+                **{update_type: keywords + extra for update_type, keywords in CATEGORY_KEYWORDS.items()},
+                IMPACT: IMPACT_KEYWORDS + extra,
+            })
+        else:
+            matcher = default_matcher()
+        
+        keyword_count = len(impact) + sum(len(keywords) for _, keywords in categories)
+        self.stdout.write(f"{len(backlog)} updates, {megabytes:.1f} MB of text, {keyword_count} keywords")
+        
+        rates = {}
+        for name, run in [
+            ('substring cascade', lambda: [legacy_classify(title, content, categories, impact) for title, content in backlog]),
+            ('compiled matcher', lambda: [classify(title, content, matcher) for title, content in backlog]),
+        ]:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            rates[name] = len(backlog) / elapsed
+            self.stdout.write(f"{name:>18}: {rates[name]:,.0f} updates/s ({megabytes / elapsed:.1f} MB/s)")
+        
+        self.stdout.write(
+            f"Relative to the substring cascade with {keyword_count} keywords: "
+            f"{rates['compiled matcher'] / rates['substring cascade']:.2f}x"
+        )
@@ -0,0 +1,86 @@
+"""
+Check that the streaming extractor matches the BeautifulSoup extractor it replaced
+"""
+import random
+import re
+import warnings
+from pathlib import Path
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from django.core.management.base import BaseCommand, CommandError
+from monitor.extraction import extract_candidates
+
+CORPUS_DIR = Path(__file__).resolve().parents[2] / 'fixtures' / 'extraction'
+
+# Chunk sizes to feed the corpus in; small ones split tags and multi-byte characters
+CHUNK_SIZES = (64 * 1024, 4096, 97, 7)
+
+RANDOM_TAGS = ('h1', 'h2', 'h3', 'h4', 'article', 'div', 'section', 'p', 'span', 'script', 'style')
+RANDOM_CLASSES = ('', 'post', 'news-item', 'Article', 'updates', 'card', 'repost', 'footer')
+RANDOM_WORDS = (
+    'Acme announces new pricing for Pro plan starting March with discounts release partnership '
+    'café naïve – “quoted” &amp; &lt;tag&gt;'
+).split()
+
+
+def legacy_extract(content, limit=5):
+    """The BeautifulSoup extraction HeuristicExtractor replaced, kept as the reference"""
+    with warnings.catch_warnings():
+        # XHTML pages with an XML declaration are parsed as HTML, as the crawler always did
+        warnings.simplefilter('ignore', XMLParsedAsHTMLWarning)
+        soup = BeautifulSoup(content, 'lxml')
+    headings = soup.find_all(['h1', 'h2', 'h3', 'h4'])
+    articles = soup.find_all(['article', 'div'], class_=re.compile(r'post|article|news|update', re.I))
+    
+    texts = []
+    for element in headings[:10] + articles[:10]:
+        text = element.get_text(strip=True)
+        if text and len(text) > 20:
+            texts.append(text)
+    return texts[:limit]
+
+
+def random_page(rng, elements=40):
+    """Return a random, possibly malformed, HTML page as UTF-8 bytes"""
+    parts = ['<html><body>']
+    for _ in range(elements):
+        tag = rng.choice(RANDOM_TAGS)
+        css_class = rng.choice(RANDOM_CLASSES)
+        attributes = f' class="{css_class}"' if css_class else ''
+        text = ' '.join(rng.choice(RANDOM_WORDS) for _ in range(rng.randint(0, 12)))
+        closing = f'</{tag}>' if rng.random() < 0.85 else ''
+        parts.append(f'<{tag}{attributes}>{text}{closing}')
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+class Command(BaseCommand):
+    help = 'Compare the streaming extractor with the legacy BeautifulSoup extractor on the fixture corpus'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', default=str(CORPUS_DIR), help='Directory of .html pages to compare')
+        parser.add_argument('--random', type=int, default=0, help='Also compare this many random pages')
+        parser.add_argument('--seed', type=int, default=0)
+    
+    def handle(self, *args, **options):
+        pages = [(path.name, path.read_bytes()) for path in sorted(Path(options['corpus']).glob('*.html'))]
+        if not pages and not options['random']:
+            raise CommandError(f"No .html pages found in {options['corpus']}")
+        
+        rng = random.Random(options['seed'])
+        pages += [(f'random-{number}', random_page(rng)) for number in range(options['random'])]
+        
+        mismatches = 0
+        for name, content in pages:
+            expected = legacy_extract(content)
+            for chunk_size in CHUNK_SIZES:
+                actual = extract_candidates(content, chunk_size=chunk_size)
+                if actual != expected:
+                    mismatches += 1
+                    self.stdout.write(self.style.ERROR(f"{name} (chunks of {chunk_size} bytes):"))
+                    self.stdout.write(f"  expected {expected!r}")
+                    self.stdout.write(f"  got      {actual!r}")
+                    break
+        
+        if mismatches:
+            raise CommandError(f"{mismatches} of {len(pages)} pages differ from the legacy extractor")
+        self.stdout.write(self.style.SUCCESS(f"All {len(pages)} pages match the legacy extractor"))
@@ -0,0 +1,45 @@
+"""
+Measure how well the SimHash near-duplicate check separates reworded repeats from distinct updates
+"""
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from monitor.dedup import NEAR_DUPLICATE_THRESHOLD, band_keys, simhash, similarity, SIMHASH_BITS
+
+PAIRS_FILE = Path(__file__).resolve().parents[2] / 'fixtures' / 'dedup' / 'title_pairs.json'
+
+
+class Command(BaseCommand):
+    help = 'Report recall and false positives of the near-duplicate check on labelled title pairs'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--pairs', default=str(PAIRS_FILE),
+                            help='JSON file with "duplicates" and "distinct" lists of [title, title] pairs')
+        parser.add_argument('--threshold', type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                            help='Similarity threshold to evaluate')
+    
+    def handle(self, *args, **options):
+        try:
+            with open(options['pairs'], encoding='utf-8') as f:
+                pairs = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Can't read {options['pairs']}: {e}")
+        
+        threshold = options['threshold']
+        for label, expected in [('duplicates', True), ('distinct', False)]:
+            rows = pairs.get(label, [])
+            found = 0
+            for first, second in rows:
+                a, b = simhash(first), simhash(second)
+                score = similarity(a, b)
+                # Pairs are only compared when the band index returns one for the other
+                detected = score >= threshold and bool(set(band_keys(a)) & set(band_keys(b)))
+                found += detected
+                if detected != expected and options['verbosity'] >= 2:
+                    bits = round((1 - score) * SIMHASH_BITS)
+                    self.stdout.write(f"  {'missed' if expected else 'false match'} ({bits} bits): "
+                                      f"{first!r} / {second!r}")
+            
+            share = found / len(rows) if rows else 0
+            name = 'recall on reworded repeats' if expected else 'false positives on distinct updates'
+            self.stdout.write(f"{name}: {found}/{len(rows)} ({share:.0%}) at threshold {threshold:.2f}")
@@ -0,0 +1,30 @@
+"""
+Recompute the daily update rollup that trend detection reads
+"""
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from monitor.models import DailyUpdateRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-day, per-competitor, per-type update counts from stored and archived updates'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help='Only rebuild the last N days instead of the whole history')
+    
+    def handle(self, *args, **options):
+        since = None
+        if options['days'] is not None:
+            if options['days'] < 0:
+                raise CommandError('--days must not be negative')
+            since = timezone.localdate() - timedelta(days=options['days'])
+        
+        started = time.monotonic()
+        rows = DailyUpdateRollup.rebuild(since)
+        scope = f"since {since}" if since is not None else 'for all days'
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} rollup rows {scope} in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,22 @@
+"""
+Recompute the unread notification counters behind the navigation badge
+"""
+import time
+from django.core.management.base import BaseCommand
+from monitor.models import UnreadNotificationCounter
+
+
+class Command(BaseCommand):
+    help = 'Recount every user\'s unread notifications from the notifications table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append',
+                            help='Only recount this user id (can be repeated)')
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        UnreadNotificationCounter.recount(options['user'])
+        scope = f"{len(options['user'])} users" if options['user'] else 'all users'
+        self.stdout.write(self.style.SUCCESS(
+            f"Recounted unread notifications of {scope} in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,150 @@
+"""
+Re-run extraction and classification over archived page snapshots
+"""
+import time
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from monitor.classification import get_keyword_matcher, watched_keywords, boosted_score
+from monitor.models import (
+    Competitor, CompetitorUpdate, DailyUpdateRollup, ExtractionRule, FetchState, MonitoringConfig, PageSnapshot,
+    Trend
+)
+from monitor.services import CompetitorMonitor
+from monitor.workers import create_pool, parse_page_task
+
+
+class Command(BaseCommand):
+    help = 'Re-run extraction and classification over archived page snapshots without fetching'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--competitor', type=int, action='append',
+                            help='Only reprocess this competitor id (can be repeated)')
+        parser.add_argument('--create', action='store_true',
+                            help='Also store updates the current extractor finds that are not in the database')
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+        parser.add_argument('--chunk-size', type=int, default=100, help='Snapshots loaded per batch')
+        parser.add_argument('--workers', type=int, default=0, help='Parse in this many worker processes')
+    
+    def handle(self, *args, **options):
+        monitor = CompetitorMonitor(parse_workers=0)
+        pairs = self.snapshot_pairs(options['competitor'])
+        competitors = Competitor.objects.in_bulk({competitor_id for competitor_id, _ in pairs})
+        rules = {
+            rule.competitor_id: monitor.rule_spec(rule)
+            for rule in ExtractionRule.objects.filter(competitor_id__in=competitors, is_enabled=True)
+        }
+        # Watched keywords filter and boost updates the same way they do when pages are first fetched
+        configs = {
+            config.competitor_id: config for config in MonitoringConfig.objects.filter(competitor_id__in=competitors)
+        }
+        
+        stats = defaultdict(int)
+        started = time.monotonic()
+        pool = create_pool(options['workers']) if options['workers'] > 0 else None
+        try:
+            chunk_size = max(1, options['chunk_size'])
+            for start in range(0, len(pairs), chunk_size):
+                chunk = pairs[start:start + chunk_size]
+                self.process_chunk(monitor, pool, chunk, competitors, rules, configs, options, stats)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        elapsed = time.monotonic() - started
+        megabytes = stats['bytes'] / 1_000_000
+        if stats['truncated']:
+            self.stdout.write(self.style.WARNING(
+                f"{stats['truncated']} snapshots were cut off at the byte cap when fetched; "
+                f"updates past that point could not be found"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Reprocessed {stats['snapshots']} snapshots ({megabytes:.1f} MB) in {elapsed:.1f}s "
+            f"({megabytes / elapsed if elapsed else 0:.1f} MB/s): "
+            f"{stats['reclassified']} updates reclassified, {stats['created']} created"
+            + (' (dry run)' if options['dry_run'] else '')
+        ))
+    
+    def snapshot_pairs(self, competitor_ids):
+        """Return sorted (competitor_id, snapshot_id) pairs to reprocess"""
+        updates = CompetitorUpdate.objects.filter(snapshot__isnull=False)
+        if competitor_ids:
+            updates = updates.filter(competitor_id__in=competitor_ids)
+        pairs = set(updates.values_list('competitor_id', 'snapshot_id').distinct())
+        
+        # Latest snapshots of each website, even if nothing was extracted from them
+        websites = defaultdict(list)
+        competitors = Competitor.objects.all()
+        if competitor_ids:
+            competitors = competitors.filter(pk__in=competitor_ids)
+        for competitor_id, website in competitors.values_list('id', 'website'):
+            websites[website].append(competitor_id)
+        states = FetchState.objects.filter(snapshot__isnull=False, url__in=websites)
+        for url, snapshot_id in states.values_list('url', 'snapshot_id'):
+            for competitor_id in websites[url]:
+                pairs.add((competitor_id, snapshot_id))
+        
+        return sorted(pairs, key=lambda pair: (pair[1], pair[0]))
+    
+    def process_chunk(self, monitor, pool, chunk, competitors, rules, configs, options, stats):
+        snapshots = PageSnapshot.objects.in_bulk({snapshot_id for _, snapshot_id in chunk})
+        chunk = [(competitors[c], snapshots[s]) for c, s in chunk if c in competitors and s in snapshots]
+        
+        contents = {}
+        for _, snapshot in chunk:
+            if snapshot.pk not in contents:
+                contents[snapshot.pk] = snapshot.content()
+                stats['snapshots'] += 1
+                stats['bytes'] += len(contents[snapshot.pk])
+                stats['truncated'] += snapshot.truncated
+        
+        args = (
+            [competitor.website for competitor, _ in chunk],
+            [contents[snapshot.pk] for _, snapshot in chunk],
+            [rules.get(competitor.pk) for competitor, _ in chunk],
+        )
+        if pool is not None:
+            parsed = list(pool.map(parse_page_task, *args))
+        else:
+            parsed = [monitor.parse_page(*task) for task in zip(*args)]
+        
+        changed = []
+        rollup = defaultdict(int)
+        with transaction.atomic():
+            for (competitor, snapshot), records in zip(chunk, parsed):
+                config = configs.get(competitor.pk)
+                matcher = get_keyword_matcher(config.pk, config.keywords) if config is not None else None
+                by_title = {record['title']: record for record in records}
+                existing = CompetitorUpdate.objects.filter(competitor=competitor, snapshot=snapshot).only(
+                    'id', 'competitor_id', 'title', 'update_type', 'impact_score', 'is_high_impact', 'detected_at'
+                )
+                for update in existing:
+                    record = by_title.get(update.title)
+                    if record is None:
+                        continue
+                    impact_score = record['impact_score']
+                    if matcher is not None:
+                        found = watched_keywords(matcher, record['title'], record['content'])
+                        impact_score = boosted_score(impact_score, found)
+                    values = (record['update_type'], impact_score, impact_score >= 60)
+                    if (update.update_type, update.impact_score, update.is_high_impact) != values:
+                        if update.update_type != values[0]:
+                            rollup[DailyUpdateRollup.key_for(update)] -= 1
+                            rollup[DailyUpdateRollup.key_for(update, values[0])] += 1
+                        update.update_type, update.impact_score, update.is_high_impact = values
+                        changed.append(update)
+                
+                if options['create'] and not options['dry_run']:
+                    stats['created'] += len(monitor.store_new_updates(
+                        competitor, monitor.apply_keywords(config, records), snapshot,
+                        config.near_duplicate_threshold if config is not None else None
+                    ))
+            
+            stats['reclassified'] += len(changed)
+            if changed and not options['dry_run']:
+                CompetitorUpdate.objects.bulk_update(changed, ['update_type', 'impact_score', 'is_high_impact'])
+                # Daily counts move with the reclassified updates, in the same transaction
+                DailyUpdateRollup.add(rollup)
+                if rollup:
+                    # Reclassified updates may belong to other type trends now
+                    Trend.objects.filter(members_synced_at__isnull=False).update(members_synced_at=None)
@@ -0,0 +1,141 @@
+"""
+Recompute the classification of stored updates after the keyword rules change
+"""
+import json
+import os
+import time
+from collections import defaultdict, deque
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from monitor.classification import get_keyword_matcher, watched_keywords, boosted_score
+from monitor.models import CompetitorUpdate, DailyUpdateRollup, MonitoringConfig, Trend
+from monitor.workers import create_pool, classify_updates_task
+
+HIGH_IMPACT_SCORE = 60
+
+
+class Command(BaseCommand):
+    help = 'Recompute update_type, impact_score and is_high_impact for stored updates'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--competitor', type=int, action='append',
+                            help='Only rescore updates of this competitor id (can be repeated)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Updates scored and saved per batch')
+        parser.add_argument('--workers', type=int, default=0, help='Score in this many worker processes')
+        parser.add_argument('--checkpoint', default='rescore.checkpoint',
+                            help='File recording the last rescored update id')
+        parser.add_argument('--resume', action='store_true', help='Continue after the id in the checkpoint file')
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+    
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        last_pk = self.read_checkpoint(options['checkpoint']) if options['resume'] else 0
+        
+        updates = CompetitorUpdate.objects.filter(pk__gt=last_pk).order_by('pk').only(
+            'id', 'competitor_id', 'title', 'content', 'update_type', 'impact_score', 'is_high_impact', 'detected_at'
+        )
+        if options['competitor']:
+            updates = updates.filter(competitor_id__in=options['competitor'])
+        rows = updates.iterator(chunk_size=chunk_size)
+        
+        # Watched keywords boost scores the same way they do when updates are first stored
+        self.matchers = {
+            competitor_id: get_keyword_matcher(config_id, keywords)
+            for config_id, competitor_id, keywords
+            in MonitoringConfig.objects.exclude(keywords='').values_list('id', 'competitor_id', 'keywords')
+        }
+        
+        stats = {'rows': 0, 'changed': 0}
+        started = time.monotonic()
+        pool = create_pool(options['workers']) if options['workers'] > 0 else None
+        max_in_flight = 2 * options['workers'] if pool is not None else 0
+        try:
+            # Chunks are saved in order, so the checkpoint never skips an unsaved chunk;
+            # at most two chunks per worker are held in memory at a time
+            in_flight = deque()
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if chunk:
+                    in_flight.append((chunk, self.score(pool, chunk)))
+                if in_flight and (not chunk or len(in_flight) > max_in_flight):
+                    done, scores = in_flight.popleft()
+                    self.save_chunk(done, scores.result() if pool is not None else scores, options, stats)
+                    if not options['dry_run']:
+                        self.write_checkpoint(options['checkpoint'], done[-1].pk)
+                    if options['verbosity'] >= 2:
+                        self.stdout.write(self.report(stats, started))
+                elif not chunk:
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        
+        if not options['dry_run'] and os.path.exists(options['checkpoint']):
+            os.remove(options['checkpoint'])
+        self.stdout.write(self.style.SUCCESS(self.report(stats, started, options['dry_run'])))
+    
+    def score(self, pool, chunk):
+        titles = [update.title for update in chunk]
+        contents = [update.content for update in chunk]
+        if pool is not None:
+            return pool.submit(classify_updates_task, titles, contents)
+        return classify_updates_task(titles, contents)
+    
+    def save_chunk(self, chunk, scores, options, stats):
+        """
+        Save the new scores of one chunk in a single transaction.
+
+        A chunk only holds a few distinct (type, score) results, so changed rows
+        are written with one UPDATE ... WHERE id IN (...) per distinct result
+        rather than bulk_update()'s per-row CASE expressions.
+        """
+        changed = defaultdict(list)
+        rollup = defaultdict(int)
+        for update, update_type, impact_score in zip(chunk, *scores):
+            matcher = self.matchers.get(update.competitor_id)
+            if matcher is not None:
+                impact_score = boosted_score(impact_score, watched_keywords(matcher, update.title, update.content))
+            values = (update_type, impact_score, impact_score >= HIGH_IMPACT_SCORE)
+            if (update.update_type, update.impact_score, update.is_high_impact) != values:
+                changed[values].append(update.pk)
+                if update.update_type != update_type:
+                    rollup[DailyUpdateRollup.key_for(update)] -= 1
+                    rollup[DailyUpdateRollup.key_for(update, update_type)] += 1
+        
+        stats['rows'] += len(chunk)
+        stats['changed'] += sum(len(pks) for pks in changed.values())
+        if changed and not options['dry_run']:
+            with transaction.atomic():
+                for (update_type, impact_score, is_high_impact), pks in changed.items():
+                    CompetitorUpdate.objects.filter(pk__in=pks).update(
+                        update_type=update_type, impact_score=impact_score, is_high_impact=is_high_impact
+                    )
+                DailyUpdateRollup.add(rollup)
+                if rollup:
+                    # Reclassified updates may belong to other type trends now
+                    Trend.objects.filter(members_synced_at__isnull=False).update(members_synced_at=None)
+    
+    def read_checkpoint(self, path):
+        """Return the id of the last update a previous run saved, or 0 without a checkpoint"""
+        try:
+            with open(path) as checkpoint:
+                return int(json.load(checkpoint)['last_pk'])
+        except FileNotFoundError:
+            return 0
+        except (ValueError, KeyError, TypeError) as e:
+            raise CommandError(f"Unreadable checkpoint {path}: {str(e)}")
+    
+    def write_checkpoint(self, path, last_pk):
+        # Written to a temporary file first so an interrupted run never leaves a truncated checkpoint
+        with open(f'{path}.tmp', 'w') as checkpoint:
+            json.dump({'last_pk': last_pk}, checkpoint)
+        os.replace(f'{path}.tmp', path)
+    
+    def report(self, stats, started, dry_run=False):
+        elapsed = time.monotonic() - started
+        rate = stats['rows'] / elapsed if elapsed else 0
+        return (
+            f"Rescored {stats['rows']} updates in {elapsed:.1f}s ({rate:,.0f} rows/s): "
+            f"{stats['changed']} changed" + (' (dry run)' if dry_run else '')
+        )
@@ -0,0 +1,57 @@
+"""
+Delete read notifications and archive old updates according to the retention policies
+"""
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from monitor.retention import ReadNotificationPolicy, UpdateArchivePolicy, default_policies, run_policy
+
+
+class Command(BaseCommand):
+    help = 'Apply the retention policies: delete old read notifications and archive old updates'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--read-notification-days', type=int,
+                            help='Delete read notifications older than this many days (0 keeps them)')
+        parser.add_argument('--archive-after-months', type=int,
+                            help='Archive updates detected more than this many months ago (0 keeps them)')
+        parser.add_argument('--chunk-size', type=int,
+                            default=getattr(settings, 'MONITOR_RETENTION_CHUNK_SIZE', 500),
+                            help='Rows reclaimed per transaction')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to sleep between chunks to leave room for other writers')
+        parser.add_argument('--dry-run', action='store_true', help='Count expired rows without removing them')
+    
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        
+        policies = {policy.name: policy for policy in default_policies()}
+        if options['read_notification_days'] is not None:
+            policies.pop(ReadNotificationPolicy.name, None)
+            if options['read_notification_days'] > 0:
+                policies[ReadNotificationPolicy.name] = ReadNotificationPolicy(
+                    timedelta(days=options['read_notification_days'])
+                )
+        if options['archive_after_months'] is not None:
+            policies.pop(UpdateArchivePolicy.name, None)
+            if options['archive_after_months'] > 0:
+                policies[UpdateArchivePolicy.name] = UpdateArchivePolicy(
+                    relativedelta(months=options['archive_after_months'])
+                )
+        
+        if not policies:
+            self.stdout.write('No retention policies are enabled')
+            return
+        
+        progress = None
+        if options['verbosity'] >= 2:
+            progress = lambda report: self.stdout.write(str(report))
+        
+        for policy in policies.values():
+            report = run_policy(
+                policy, options['chunk_size'], options['pause'], options['dry_run'], progress=progress
+            )
+            prefix = '[dry run] ' if options['dry_run'] else ''
+            self.stdout.write(self.style.SUCCESS(f"{prefix}{report}"))
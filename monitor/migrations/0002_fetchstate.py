@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FetchState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=100)),
+                ('content_hash', models.CharField(blank=True, help_text='SHA-256 of the last fetched body', max_length=64)),
+                ('last_status', models.IntegerField(blank=True, null=True)),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0002_fetchstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractionRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_selector', models.CharField(help_text='CSS selector (or XPath starting with /) matching each update', max_length=500)),
+                ('title_selector', models.CharField(blank=True, help_text='Relative to the item; defaults to the item text', max_length=500)),
+                ('content_selector', models.CharField(blank=True, help_text='Relative to the item; defaults to the item text', max_length=500)),
+                ('link_selector', models.CharField(blank=True, help_text='Relative to the item; defaults to the first link', max_length=500)),
+                ('date_selector', models.CharField(blank=True, help_text='Relative to the item; uses a datetime attribute if present', max_length=500)),
+                ('max_items', models.PositiveIntegerField(default=5)),
+                ('is_enabled', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('competitor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='extraction_rule', to='monitor.competitor')),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0003_extractionrule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='avg_latency_ms',
+            field=models.FloatField(blank=True, help_text='Moving average of fetch latency', null=True),
+        ),
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='backoff_until',
+            field=models.DateTimeField(blank=True, help_text='Fetches are skipped until this time', null=True),
+        ),
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='breaker_state',
+            field=models.CharField(choices=[('closed', 'Closed'), ('open', 'Open'), ('half_open', 'Half-open')], default='closed', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='consecutive_failures',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='last_error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='last_failure_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0004_monitoring_circuit_breaker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(help_text='SHA-256 of the raw body', max_length=64, unique=True)),
+                ('url', models.URLField(help_text='URL the body was first fetched from', max_length=500)),
+                ('size', models.IntegerField(help_text='Uncompressed size in bytes')),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='competitorupdate',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updates', to='monitor.pagesnapshot'),
+        ),
+        migrations.AddField(
+            model_name='fetchstate',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='monitor.pagesnapshot'),
+        ),
+    ]
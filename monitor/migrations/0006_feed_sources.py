@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0005_page_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='feeds_discovered_at',
+            field=models.DateTimeField(blank=True, help_text='Last time feeds and sitemaps were looked for', null=True),
+        ),
+        migrations.CreateModel(
+            name='FeedSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500)),
+                ('kind', models.CharField(blank=True, choices=[('rss', 'RSS'), ('atom', 'Atom'), ('sitemap', 'Sitemap'), ('sitemapindex', 'Sitemap index')], max_length=20)),
+                ('is_verified', models.BooleanField(default=False, help_text='Discovered URLs are verified on their first fetch')),
+                ('is_enabled', models.BooleanField(default=True)),
+                ('last_guid', models.CharField(blank=True, help_text='GUID of the newest entry seen', max_length=500)),
+                ('last_published', models.DateTimeField(blank=True, help_text='Newest entry date or lastmod seen', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('competitor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feeds', to='monitor.competitor')),
+            ],
+            options={
+                'unique_together': {('competitor', 'url')},
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:48
+
+import hashlib
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# A copy of monitor.dedup as of this migration, so later changes to it never alter the backfill
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(_NON_WORD_RE.sub(' ', text).split())
+
+
+def fingerprint(title):
+    return hashlib.sha1(normalize_text(title).encode('utf-8')).hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint existing updates; later duplicates of an earlier title keep a NULL fingerprint"""
+    CompetitorUpdate = apps.get_model('monitor', 'CompetitorUpdate')
+    competitor_ids = CompetitorUpdate.objects.values_list('competitor_id', flat=True).distinct()
+
+    for competitor_id in competitor_ids.order_by('competitor_id'):
+        seen = set()
+        batch = []
+        rows = CompetitorUpdate.objects.filter(competitor_id=competitor_id).order_by('detected_at', 'pk')
+        for pk, title in rows.values_list('pk', 'title').iterator(chunk_size=2000):
+            value = fingerprint(title)
+            if value in seen:
+                continue
+            seen.add(value)
+            batch.append(CompetitorUpdate(pk=pk, fingerprint=value))
+            if len(batch) >= 1000:
+                CompetitorUpdate.objects.bulk_update(batch, ['fingerprint'])
+                batch = []
+        if batch:
+            CompetitorUpdate.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0006_feed_sources'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competitorupdate',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='Hash of the normalized title, unique per competitor', max_length=40, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='competitorupdate',
+            constraint=models.UniqueConstraint(fields=('competitor', 'fingerprint'), name='unique_update_fingerprint'),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:50
+
+import hashlib
+import re
+import unicodedata
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+# A copy of monitor.dedup as of this migration: SimHash of character shingles, in 6 bands
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 4
+BAND_WIDTHS = (11, 11, 11, 11, 10, 10)
+BAND_KEY_SHIFT = 11
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(_NON_WORD_RE.sub(' ', text).split())
+
+
+def simhash(text):
+    text = normalize_text(text)
+    if len(text) <= SHINGLE_SIZE:
+        shingles = [text]
+    else:
+        shingles = [text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)]
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles
+    ]
+
+    half = len(hashes) / 2
+    signature = 0
+    for bit in range(SIMHASH_BITS):
+        mask = 1 << bit
+        if sum(1 for value in hashes if value & mask) > half:
+            signature |= mask
+    return signature
+
+
+def band_keys(signature):
+    keys = []
+    shift = 0
+    for index, width in enumerate(BAND_WIDTHS):
+        keys.append(index << BAND_KEY_SHIFT | (signature >> shift) & ((1 << width) - 1))
+        shift += width
+    return keys
+
+
+def to_signed(signature):
+    return signature - (1 << SIMHASH_BITS) if signature >= 1 << (SIMHASH_BITS - 1) else signature
+
+
+def backfill_simhashes(apps, schema_editor):
+    """Sign existing updates and index their LSH bands in batches"""
+    CompetitorUpdate = apps.get_model('monitor', 'CompetitorUpdate')
+    SimHashBand = apps.get_model('monitor', 'SimHashBand')
+
+    updates = []
+    bands = []
+    rows = CompetitorUpdate.objects.order_by('pk').values_list('pk', 'competitor_id', 'title', 'content')
+    for pk, competitor_id, title, content in rows.iterator(chunk_size=2000):
+        signature = simhash(f"{title} {content}")
+        updates.append(CompetitorUpdate(pk=pk, simhash=to_signed(signature)))
+        bands.extend(
+            SimHashBand(update_id=pk, competitor_id=competitor_id, key=key)
+            for key in band_keys(signature)
+        )
+        if len(updates) >= 1000:
+            CompetitorUpdate.objects.bulk_update(updates, ['simhash'])
+            SimHashBand.objects.bulk_create(bands)
+            updates = []
+            bands = []
+    if updates:
+        CompetitorUpdate.objects.bulk_update(updates, ['simhash'])
+        SimHashBand.objects.bulk_create(bands)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0007_update_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competitorupdate',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='SimHash of the title and content, stored signed', null=True),
+        ),
+        migrations.AddField(
+            model_name='monitoringconfig',
+            name='near_duplicate_threshold',
+            field=models.FloatField(default=0.92, help_text='0-1 similarity above which an update counts as a reworded repeat; 1 disables', validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(1.0)]),
+        ),
+        migrations.CreateModel(
+            name='SimHashBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.IntegerField(help_text='Band position and bits, see dedup.band_keys')),
+                ('competitor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='monitor.competitor')),
+                ('update', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='simhash_bands', to='monitor.competitorupdate')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['competitor', 'key'], name='monitor_sim_competi_5453a9_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_simhashes, migrations.RunPython.noop),
+    ]
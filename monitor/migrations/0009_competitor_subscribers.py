@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0008_near_duplicate_simhash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competitor',
+            name='subscribers',
+            field=models.ManyToManyField(blank=True, help_text='Users notified about this competitor when notifications go to subscribers only', related_name='subscribed_competitors', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0009_competitor_subscribers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='is_digest',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='update_ids',
+            field=models.JSONField(blank=True, default=list, help_text='Ids of the updates in a digest'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='window_start',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
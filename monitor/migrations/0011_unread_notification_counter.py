@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_unread_counters(apps, schema_editor):
+    """Create a counter for every user with unread notifications"""
+    Notification = apps.get_model('monitor', 'Notification')
+    UnreadNotificationCounter = apps.get_model('monitor', 'UnreadNotificationCounter')
+    unread = (
+        Notification.objects.filter(is_read=False).order_by()
+        .values('user').annotate(unread=Count('id')).values_list('user', 'unread')
+    )
+    UnreadNotificationCounter.objects.bulk_create(
+        (UnreadNotificationCounter(user_id=user_id, count=count) for user_id, count in unread.iterator()),
+        batch_size=900,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('monitor', '0010_notification_digests'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadNotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], name='notification_user_unread_idx'),
+        ),
+        migrations.RunPython(backfill_unread_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0011_unread_notification_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedUpdate',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Id the update had in CompetitorUpdate', primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=500)),
+                ('url', models.URLField(blank=True)),
+                ('update_type', models.CharField(choices=[('pricing', 'Pricing Change'), ('campaign', 'Marketing Campaign'), ('release', 'Product Release'), ('partnership', 'Partnership'), ('news', 'News/Announcement'), ('feature', 'Feature Update'), ('other', 'Other')], default='other', max_length=20)),
+                ('impact_score', models.IntegerField(default=0)),
+                ('is_high_impact', models.BooleanField(default=False)),
+                ('source', models.CharField(default='website', max_length=100)),
+                ('detected_at', models.DateTimeField()),
+                ('published_date', models.DateTimeField(blank=True, null=True)),
+                ('fingerprint', models.CharField(blank=True, max_length=40, null=True)),
+                ('data', models.BinaryField(help_text='gzip-compressed content')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('competitor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_updates', to='monitor.competitor')),
+            ],
+            options={
+                'ordering': ['-detected_at'],
+                'indexes': [models.Index(fields=['competitor', 'fingerprint'], name='monitor_arc_competi_a0ffea_idx'), models.Index(fields=['-detected_at'], name='monitor_arc_detecte_68c804_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollup(apps, schema_editor):
+    """Count every stored and archived update by day, competitor and type"""
+    DailyUpdateRollup = apps.get_model('monitor', 'DailyUpdateRollup')
+    rows = {}
+    for name in ('CompetitorUpdate', 'ArchivedUpdate'):
+        counts = (
+            apps.get_model('monitor', name).objects.order_by()
+            .annotate(day=TruncDate('detected_at')).values_list('day', 'competitor_id', 'update_type')
+            .annotate(n=Count('id'))
+        )
+        for day, competitor_id, update_type, n in counts:
+            rows[(day, competitor_id, update_type)] = rows.get((day, competitor_id, update_type), 0) + n
+    DailyUpdateRollup.objects.bulk_create(
+        [DailyUpdateRollup(day=day, competitor_id=competitor_id, update_type=update_type, count=n)
+         for (day, competitor_id, update_type), n in rows.items()],
+        batch_size=900,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0012_archived_updates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUpdateRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('update_type', models.CharField(choices=[('pricing', 'Pricing Change'), ('campaign', 'Marketing Campaign'), ('release', 'Product Release'), ('partnership', 'Partnership'), ('news', 'News/Announcement'), ('feature', 'Feature Update'), ('other', 'Other')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('competitor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='monitor.competitor')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='monitor_dai_day_62fecc_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'competitor', 'update_type'), name='unique_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0013_daily_update_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trend',
+            name='members_cutoff',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Start of the window related_updates was last synced for', null=True),
+        ),
+        migrations.AddField(
+            model_name='trend',
+            name='members_synced_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When related_updates was last synced; empty forces a full sync', null=True),
+        ),
+    ]
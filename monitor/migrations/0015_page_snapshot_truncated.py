@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0014_trend_member_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagesnapshot',
+            name='truncated',
+            field=models.BooleanField(default=False, help_text='The body was cut off at MONITOR_MAX_PAGE_BYTES'),
+        ),
+    ]
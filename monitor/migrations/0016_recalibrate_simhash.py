@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:37
+
+import hashlib
+import re
+import unicodedata
+
+import django.core.validators
+from django.db import migrations, models
+
+# A copy of monitor.dedup as of this migration: SimHash of words and word pairs, in 9 bands
+SIMHASH_BITS = 64
+STOP_WORDS = frozenset(
+    'a an the and or of for to in on at by with from its it is are be was were this that these those '
+    'our your their we you they us now new has have will today here all more'.split()
+)
+BAND_WIDTHS = (8, 7, 7, 7, 7, 7, 7, 7, 7)
+BAND_KEY_SHIFT = 8
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(_NON_WORD_RE.sub(' ', text).split())
+
+
+def signature_words(text):
+    words = [word for word in normalize_text(text).split() if word not in STOP_WORDS]
+    return [word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word
+            for word in words]
+
+
+def simhash(text):
+    words = signature_words(text)
+    features = words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+    hashes = [
+        int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for feature in features or ['']
+    ]
+
+    half = len(hashes) / 2
+    signature = 0
+    for bit in range(SIMHASH_BITS):
+        mask = 1 << bit
+        if sum(1 for value in hashes if value & mask) > half:
+            signature |= mask
+    return signature
+
+
+def band_keys(signature):
+    keys = []
+    shift = 0
+    for index, width in enumerate(BAND_WIDTHS):
+        keys.append(index << BAND_KEY_SHIFT | (signature >> shift) & ((1 << width) - 1))
+        shift += width
+    return keys
+
+
+def to_signed(signature):
+    return signature - (1 << SIMHASH_BITS) if signature >= 1 << (SIMHASH_BITS - 1) else signature
+
+
+PREVIOUS_THRESHOLD = 0.92
+
+
+def resign_updates(apps, schema_editor):
+    """Re-sign updates from their titles and rebuild the LSH bands for the new band layout"""
+    CompetitorUpdate = apps.get_model('monitor', 'CompetitorUpdate')
+    SimHashBand = apps.get_model('monitor', 'SimHashBand')
+    SimHashBand.objects.all().delete()
+
+    updates = []
+    bands = []
+    rows = CompetitorUpdate.objects.order_by('pk').values_list('pk', 'competitor_id', 'title')
+    for pk, competitor_id, title in rows.iterator(chunk_size=2000):
+        signature = simhash(title)
+        updates.append(CompetitorUpdate(pk=pk, simhash=to_signed(signature)))
+        bands.extend(
+            SimHashBand(update_id=pk, competitor_id=competitor_id, key=key)
+            for key in band_keys(signature)
+        )
+        if len(updates) >= 1000:
+            CompetitorUpdate.objects.bulk_update(updates, ['simhash'])
+            SimHashBand.objects.bulk_create(bands)
+            updates = []
+            bands = []
+    if updates:
+        CompetitorUpdate.objects.bulk_update(updates, ['simhash'])
+        SimHashBand.objects.bulk_create(bands)
+
+
+def move_default_threshold(apps, schema_editor):
+    """Configs still on the old default move to the calibrated one; custom thresholds are kept"""
+    MonitoringConfig = apps.get_model('monitor', 'MonitoringConfig')
+    MonitoringConfig.objects.filter(near_duplicate_threshold=PREVIOUS_THRESHOLD).update(near_duplicate_threshold=0.81)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0015_page_snapshot_truncated'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='competitorupdate',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='SimHash of the title, stored signed', null=True),
+        ),
+        migrations.AlterField(
+            model_name='monitoringconfig',
+            name='near_duplicate_threshold',
+            field=models.FloatField(default=0.81, help_text='0-1 similarity above which an update counts as a reworded repeat; 1 disables', validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(1.0)]),
+        ),
+        migrations.RunPython(resign_updates, migrations.RunPython.noop),
+        migrations.RunPython(move_default_threshold, migrations.RunPython.noop),
+    ]
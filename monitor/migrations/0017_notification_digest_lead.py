@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:08
+
+import monitor.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitor', '0016_recalibrate_simhash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='update',
+            field=models.ForeignKey(blank=True, null=True, on_delete=monitor.models.delete_or_unlead, related_name='notifications', to='monitor.competitorupdate'),
+        ),
+    ]
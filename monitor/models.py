@@ -1,6 +1,14 @@
-from django.db import models
+import gzip
+from collections import defaultdict
+from datetime import timedelta
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, TruncDate
 from django.contrib.auth.models import User
 from django.utils import timezone
+from .dedup import fingerprint, NEAR_DUPLICATE_THRESHOLD
 
 
 class Competitor(models.Model):
@@ -11,6 +19,10 @@ class Competitor(models.Model):
     industry = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    subscribers = models.ManyToManyField(
+        User, blank=True, related_name='subscribed_competitors',
+        help_text="Users notified about this competitor when notifications go to subscribers only"
+    )
     
     class Meta:
         ordering = ['name']
@@ -29,6 +41,23 @@ class UpdateType(models.TextChoices):
     OTHER = 'other', 'Other'
 
 
+class PageSnapshot(models.Model):
+    """A fetched page body, stored once per distinct content and gzip-compressed"""
+    content_hash = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the raw body")
+    url = models.URLField(max_length=500, help_text="URL the body was first fetched from")
+    size = models.IntegerField(help_text="Uncompressed size in bytes")
+    truncated = models.BooleanField(default=False, help_text="The body was cut off at MONITOR_MAX_PAGE_BYTES")
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Snapshot {self.content_hash[:12]} of {self.url}"
+    
+    def content(self):
+        """Return the decompressed page body"""
+        return gzip.decompress(bytes(self.data))
+
+
 class CompetitorUpdate(models.Model):
     """Stores individual updates from competitors"""
     competitor = models.ForeignKey(Competitor, on_delete=models.CASCADE, related_name='updates')
@@ -41,6 +70,11 @@ class CompetitorUpdate(models.Model):
     impact_score = models.IntegerField(default=0, help_text="0-100 scale for impact assessment")
     is_high_impact = models.BooleanField(default=False)
     source = models.CharField(max_length=100, default='website', help_text="Source: website, social, etc.")
+    snapshot = models.ForeignKey(PageSnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name='updates')
+    fingerprint = models.CharField(max_length=40, null=True, blank=True, editable=False,
+                                   help_text="Hash of the normalized title, unique per competitor")
+    simhash = models.BigIntegerField(null=True, blank=True, editable=False,
+                                     help_text="SimHash of the title, stored signed")
     
     class Meta:
         ordering = ['-detected_at']
@@ -49,9 +83,168 @@ class CompetitorUpdate(models.Model):
             models.Index(fields=['update_type']),
             models.Index(fields=['is_high_impact']),
         ]
+        constraints = [
+            models.UniqueConstraint(fields=['competitor', 'fingerprint'], name='unique_update_fingerprint'),
+        ]
     
     def __str__(self):
         return f"{self.competitor.name}: {self.title[:50]}"
+    
+    def save(self, *args, **kwargs):
+        # Only new rows: legacy duplicates keep the NULL fingerprint their migration left them
+        if self._state.adding and not self.fingerprint:
+            self.fingerprint = fingerprint(self.title)
+        super().save(*args, **kwargs)
+
+
+class SimHashBand(models.Model):
+    """One LSH band of an update's SimHash, indexed to look up near-duplicate candidates"""
+    update = models.ForeignKey(CompetitorUpdate, on_delete=models.CASCADE, related_name='simhash_bands')
+    competitor = models.ForeignKey(Competitor, on_delete=models.CASCADE, related_name='+')
+    key = models.IntegerField(help_text="Band position and bits, see dedup.band_keys")
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['competitor', 'key']),
+        ]
+
+
+class DailyUpdateRollup(models.Model):
+    """
+    Number of updates detected per day, competitor and update type.
+
+    Kept current as updates are stored and reclassified, so trend detection
+    reads one row per day and group instead of scanning the updates table.
+    Archived updates stay counted; rebuild() recomputes everything from
+    CompetitorUpdate and ArchivedUpdate after manual edits.
+    """
+    day = models.DateField()
+    competitor = models.ForeignKey(Competitor, on_delete=models.CASCADE, related_name='daily_rollups')
+    update_type = models.CharField(max_length=20, choices=UpdateType.choices)
+    count = models.PositiveIntegerField(default=0)
+    
+    # Rows per statement, well below the bound-parameter limits of every backend
+    BATCH_SIZE = 900
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'competitor', 'update_type'], name='unique_daily_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.competitor_id} {self.update_type}: {self.count}"
+    
+    @staticmethod
+    def key_for(update, update_type=None):
+        """Return the (day, competitor id, update type) an update is counted under"""
+        return (timezone.localdate(update.detected_at), update.competitor_id, update_type or update.update_type)
+    
+    @classmethod
+    def record(cls, updates):
+        """Count newly stored updates"""
+        counts = defaultdict(int)
+        for update in updates:
+            counts[cls.key_for(update)] += 1
+        cls.add(counts)
+    
+    @classmethod
+    def add(cls, counts):
+        """Add {(day, competitor id, update type): n} to the rollup; n may be negative"""
+        counts = {key: n for key, n in counts.items() if n}
+        if not counts:
+            return
+        cls.objects.bulk_create(
+            [cls(day=day, competitor_id=competitor_id, update_type=update_type)
+             for day, competitor_id, update_type in counts],
+            ignore_conflicts=True, batch_size=cls.BATCH_SIZE
+        )
+        # Rows of a run share a few days and types, so group competitors into one UPDATE each
+        grouped = defaultdict(list)
+        for (day, competitor_id, update_type), n in counts.items():
+            grouped[(day, update_type, n)].append(competitor_id)
+        for (day, update_type, n), competitor_ids in grouped.items():
+            count = F('count') + n if n > 0 else Greatest(F('count') + n, 0)
+            cls.objects.filter(day=day, update_type=update_type, competitor_id__in=competitor_ids).update(count=count)
+    
+    @classmethod
+    def rebuild(cls, since=None):
+        """Recompute the rollup from stored and archived updates, for every day or from `since` on"""
+        rows = defaultdict(int)
+        for model in (CompetitorUpdate, ArchivedUpdate):
+            updates = model.objects.order_by()
+            if since is not None:
+                updates = updates.filter(detected_at__date__gte=since)
+            counts = updates.annotate(day=TruncDate('detected_at')).values_list(
+                'day', 'competitor_id', 'update_type'
+            ).annotate(n=Count('id'))
+            for day, competitor_id, update_type, n in counts:
+                rows[(day, competitor_id, update_type)] += n
+        
+        with transaction.atomic():
+            existing = cls.objects.all() if since is None else cls.objects.filter(day__gte=since)
+            existing.delete()
+            cls.objects.bulk_create(
+                [cls(day=day, competitor_id=competitor_id, update_type=update_type, count=n)
+                 for (day, competitor_id, update_type), n in rows.items()],
+                batch_size=cls.BATCH_SIZE
+            )
+        return len(rows)
+
+
+class ArchivedUpdate(models.Model):
+    """
+    A compact copy of an update the retention job moved out of CompetitorUpdate.
+
+    Keeps the original id and the fingerprint, so archived items are still
+    recognised as seen, with the content gzip-compressed.
+    """
+    id = models.BigIntegerField(primary_key=True, help_text="Id the update had in CompetitorUpdate")
+    competitor = models.ForeignKey(Competitor, on_delete=models.CASCADE, related_name='archived_updates')
+    title = models.CharField(max_length=500)
+    url = models.URLField(blank=True)
+    update_type = models.CharField(max_length=20, choices=UpdateType.choices, default=UpdateType.OTHER)
+    impact_score = models.IntegerField(default=0)
+    is_high_impact = models.BooleanField(default=False)
+    source = models.CharField(max_length=100, default='website')
+    detected_at = models.DateTimeField()
+    published_date = models.DateTimeField(null=True, blank=True)
+    fingerprint = models.CharField(max_length=40, null=True, blank=True)
+    data = models.BinaryField(help_text="gzip-compressed content")
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-detected_at']
+        indexes = [
+            models.Index(fields=['competitor', 'fingerprint']),
+            models.Index(fields=['-detected_at']),
+        ]
+    
+    def __str__(self):
+        return f"Archived {self.competitor_id}: {self.title[:50]}"
+    
+    @classmethod
+    def from_update(cls, update):
+        return cls(
+            id=update.pk,
+            competitor_id=update.competitor_id,
+            title=update.title,
+            url=update.url,
+            update_type=update.update_type,
+            impact_score=update.impact_score,
+            is_high_impact=update.is_high_impact,
+            source=update.source,
+            detected_at=update.detected_at,
+            published_date=update.published_date,
+            fingerprint=update.fingerprint,
+            data=gzip.compress(update.content.encode('utf-8')),
+        )
+    
+    def content(self):
+        """Return the decompressed content"""
+        return gzip.decompress(bytes(self.data)).decode('utf-8')
 
 
 class Trend(models.Model):
@@ -64,27 +257,246 @@ class Trend(models.Model):
     last_detected = models.DateTimeField(auto_now=True)
     related_updates = models.ManyToManyField(CompetitorUpdate, related_name='trends')
     confidence_score = models.FloatField(default=0.0, help_text="0-1 scale")
+    members_synced_at = models.DateTimeField(null=True, blank=True, editable=False,
+                                             help_text="When related_updates was last synced; empty forces a full sync")
+    members_cutoff = models.DateTimeField(null=True, blank=True, editable=False,
+                                          help_text="Start of the window related_updates was last synced for")
+    
+    # Updates detected this long before the last sync are checked again, in case they committed late
+    SYNC_OVERLAP = timedelta(minutes=10)
+    BATCH_SIZE = 900
     
     class Meta:
         ordering = ['-last_detected']
     
     def __str__(self):
         return self.name
+    
+    def sync_related_updates(self, members, cutoff, now=None):
+        """
+        Make related_updates match members, a queryset of the updates in the window, by diffing.
+
+        Links to updates detected before cutoff are removed with one DELETE,
+        and only updates detected since the previous sync are looked at for
+        new links, which are inserted in batches. A full sync, on the first
+        run, when the window grows, or after members_synced_at is cleared,
+        also looks at older updates and removes links to updates that no
+        longer belong, e.g. after rescoring. Returns (added, removed).
+        """
+        now = now or timezone.now()
+        through = Trend.related_updates.through
+        links = through.objects.filter(trend_id=self.pk)
+        candidates = members.order_by()
+        
+        with transaction.atomic():
+            removed = links.filter(competitorupdate__detected_at__lt=cutoff).delete()[0]
+            if self.members_synced_at is None or self.members_cutoff is None or cutoff < self.members_cutoff:
+                removed += links.exclude(competitorupdate__in=candidates.values('pk')).delete()[0]
+            else:
+                candidates = candidates.filter(detected_at__gte=self.members_synced_at - self.SYNC_OVERLAP)
+            
+            new_ids = candidates.exclude(pk__in=links.values('competitorupdate_id')).values_list('pk', flat=True)
+            added = 0
+            batch = []
+            for update_id in new_ids.iterator(chunk_size=self.BATCH_SIZE):
+                batch.append(through(trend_id=self.pk, competitorupdate_id=update_id))
+                if len(batch) >= self.BATCH_SIZE:
+                    through.objects.bulk_create(batch, ignore_conflicts=True)
+                    added += len(batch)
+                    batch = []
+            if batch:
+                through.objects.bulk_create(batch, ignore_conflicts=True)
+                added += len(batch)
+            
+            Trend.objects.filter(pk=self.pk).update(members_synced_at=now, members_cutoff=cutoff)
+        self.members_synced_at = now
+        self.members_cutoff = cutoff
+        return added, removed
+
+
+def delete_or_unlead(collector, field, sub_objs, using):
+    """
+    on_delete of Notification.update: delete single notifications but keep digests.
+
+    A digest also lists its other updates, so it only loses its lead; callers
+    that know which updates they delete re-point it first with
+    Notification.relead_digests(). Both parts stay querysets, so single
+    notifications are still fast-deleted.
+    """
+    models.CASCADE(collector, field, sub_objs.filter(is_digest=False), using)
+    collector.add_field_update(field, None, sub_objs.filter(is_digest=True))
+
+
+delete_or_unlead.lazy_sub_objs = True
 
 
 class Notification(models.Model):
     """Notifications for high-impact competitor actions"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
-    update = models.ForeignKey(CompetitorUpdate, on_delete=models.CASCADE, related_name='notifications')
+    # For a digest, the most important of its remaining updates, or None once they are all deleted
+    update = models.ForeignKey(CompetitorUpdate, on_delete=delete_or_unlead, null=True, blank=True,
+                               related_name='notifications')
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # A digest groups the high-impact updates of one time window into a single notification
+    is_digest = models.BooleanField(default=False)
+    window_start = models.DateTimeField(null=True, blank=True)
+    update_ids = models.JSONField(default=list, blank=True, help_text="Ids of the updates in a digest")
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notification_user_unread_idx'),
+        ]
+    
+    # Notifications per statement when digests are re-pointed
+    BATCH_SIZE = 900
     
     def __str__(self):
-        return f"Notification for {self.user.username}: {self.update.title[:50]}"
+        title = self.update.title if self.update_id else self.message
+        return f"Notification for {self.user.username}: {title[:50]}"
+    
+    def mark_read(self):
+        """Mark the notification read, updating the user's unread counter if it wasn't already"""
+        with transaction.atomic():
+            if Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True):
+                UnreadNotificationCounter.decrement(self.user_id)
+        self.is_read = True
+    
+    @property
+    def update_count(self):
+        return len(self.update_ids) if self.is_digest else 1
+    
+    def to_event(self):
+        """Return the JSON-serializable form pushed to live notification streams"""
+        return {
+            'id': self.pk,
+            'update': self.update_id,
+            'message': self.message,
+            'is_digest': self.is_digest,
+            'update_count': self.update_count,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+    
+    @classmethod
+    def relead_digests(cls, updates):
+        """
+        Lead the digests led by any of the updates, which are about to be deleted, by another of their updates.
+
+        A digest's update_ids are ordered by importance, so the first one that
+        survives becomes its lead; digests with none left keep their lead and
+        lose it in the delete.
+        """
+        digests = list(cls.objects.filter(update__in=updates, is_digest=True).values_list('pk', 'update_ids'))
+        candidates = {update_id for _, update_ids in digests for update_id in update_ids}
+        surviving = set(
+            CompetitorUpdate.objects.filter(pk__in=candidates).exclude(pk__in=updates).values_list('pk', flat=True)
+        )
+        by_lead = defaultdict(list)
+        for pk, update_ids in digests:
+            lead = next((update_id for update_id in update_ids if update_id in surviving), None)
+            if lead is not None:
+                by_lead[lead].append(pk)
+        for lead, pks in by_lead.items():
+            for start in range(0, len(pks), cls.BATCH_SIZE):
+                cls.objects.filter(pk__in=pks[start:start + cls.BATCH_SIZE]).update(update_id=lead)
+    
+    @classmethod
+    def attach_updates(cls, notifications):
+        """Set digest_updates on each notification to its updates, loading all digests' updates in one query"""
+        notifications = list(notifications)
+        ids = {
+            update_id
+            for notification in notifications if notification.is_digest
+            for update_id in notification.update_ids
+        }
+        updates = CompetitorUpdate.objects.select_related('competitor').in_bulk(ids)
+        for notification in notifications:
+            if notification.is_digest:
+                notification.digest_updates = [updates[pk] for pk in notification.update_ids if pk in updates]
+            else:
+                notification.digest_updates = [notification.update]
+        return notifications
+
+
+class UnreadNotificationCounter(models.Model):
+    """
+    Number of unread notifications per user, so the unread badge is a primary key lookup.
+
+    Kept in step with F() updates wherever notifications are created or
+    marked read, and by the Notification save signals for single saves.
+    Code that deletes notifications, directly or by cascade, recounts the
+    users of unread_user_ids() afterwards; `manage.py recount_unread`
+    repairs counters after raw SQL changes.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_counter')
+    count = models.PositiveIntegerField(default=0)
+    
+    # Users per statement, well below the bound-parameter limits of every backend
+    BATCH_SIZE = 900
+    
+    def __str__(self):
+        return f"{self.user.username}: {self.count} unread"
+    
+    @classmethod
+    def count_for(cls, user):
+        """Return a user's unread notification count"""
+        return cls.objects.filter(user_id=user.pk).values_list('count', flat=True).first() or 0
+    
+    @classmethod
+    def increment(cls, counts):
+        """Add {user_id: n} to users' counters, with one UPDATE per distinct n"""
+        if not counts:
+            return
+        cls.objects.bulk_create([cls(user_id=user_id) for user_id in counts], ignore_conflicts=True,
+                                batch_size=cls.BATCH_SIZE)
+        by_amount = defaultdict(list)
+        for user_id, amount in counts.items():
+            by_amount[amount].append(user_id)
+        for amount, user_ids in by_amount.items():
+            for start in range(0, len(user_ids), cls.BATCH_SIZE):
+                cls.objects.filter(user_id__in=user_ids[start:start + cls.BATCH_SIZE]).update(
+                    count=F('count') + amount
+                )
+    
+    @classmethod
+    def decrement(cls, user_id, amount=1):
+        """Subtract amount from a user's counter, never going below zero"""
+        if amount:
+            cls.objects.filter(user_id=user_id).update(count=Greatest(F('count') - amount, 0))
+    
+    @classmethod
+    def unread_user_ids(cls, notifications):
+        """Return the ids of users with unread notifications among a queryset, to recount after deleting it"""
+        return list(notifications.filter(is_read=False).order_by().values_list('user_id', flat=True).distinct())
+    
+    @classmethod
+    def recount(cls, user_ids=None):
+        """Recompute counters from the notifications table, for all users or the given ones"""
+        unread = Notification.objects.filter(is_read=False)
+        counters = cls.objects.all()
+        if user_ids is not None:
+            unread = unread.filter(user_id__in=user_ids)
+            counters = counters.filter(user_id__in=user_ids)
+        counts = dict(unread.order_by().values('user').annotate(unread=Count('id')).values_list('user', 'unread'))
+        counters.exclude(user_id__in=unread.values('user_id')).update(count=0)
+        
+        by_count = defaultdict(list)
+        for user_id, count in counts.items():
+            by_count[count].append(user_id)
+        cls.objects.bulk_create([cls(user_id=user_id) for user_id in counts], ignore_conflicts=True,
+                                batch_size=cls.BATCH_SIZE)
+        for count, user_ids in by_count.items():
+            for start in range(0, len(user_ids), cls.BATCH_SIZE):
+                cls.objects.filter(user_id__in=user_ids[start:start + cls.BATCH_SIZE]).update(count=count)
+
+
+class BreakerState(models.TextChoices):
+    CLOSED = 'closed', 'Closed'
+    OPEN = 'open', 'Open'
+    HALF_OPEN = 'half_open', 'Half-open'
 
 
 class MonitoringConfig(models.Model):
@@ -95,8 +507,94 @@ class MonitoringConfig(models.Model):
     is_enabled = models.BooleanField(default=True)
     keywords = models.TextField(blank=True, help_text="Comma-separated keywords to monitor")
     
+    # Circuit breaker for the competitor's website
+    breaker_state = models.CharField(max_length=10, choices=BreakerState.choices, default=BreakerState.CLOSED)
+    consecutive_failures = models.IntegerField(default=0)
+    last_failure_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=255, blank=True)
+    backoff_until = models.DateTimeField(null=True, blank=True, help_text="Fetches are skipped until this time")
+    avg_latency_ms = models.FloatField(null=True, blank=True, help_text="Moving average of fetch latency")
+    near_duplicate_threshold = models.FloatField(
+        default=NEAR_DUPLICATE_THRESHOLD,
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
+        help_text="0-1 similarity above which an update counts as a reworded repeat; 1 disables"
+    )
+    feeds_discovered_at = models.DateTimeField(null=True, blank=True, help_text="Last time feeds and sitemaps were looked for")
+    
     def __str__(self):
         return f"Monitoring config for {self.competitor.name}"
 
 
+class ExtractionRule(models.Model):
+    """Per-competitor selectors that replace the generic heading/article heuristics"""
+    competitor = models.OneToOneField(Competitor, on_delete=models.CASCADE, related_name='extraction_rule')
+    item_selector = models.CharField(max_length=500, help_text="CSS selector (or XPath starting with /) matching each update")
+    title_selector = models.CharField(max_length=500, blank=True, help_text="Relative to the item; defaults to the item text")
+    content_selector = models.CharField(max_length=500, blank=True, help_text="Relative to the item; defaults to the item text")
+    link_selector = models.CharField(max_length=500, blank=True, help_text="Relative to the item; defaults to the first link")
+    date_selector = models.CharField(max_length=500, blank=True, help_text="Relative to the item; uses a datetime attribute if present")
+    max_items = models.PositiveIntegerField(default=5)
+    is_enabled = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Extraction rule for {self.competitor.name}"
+    
+    def selectors(self):
+        """Return the selector fields as keyword arguments for CompiledRule"""
+        return {
+            'item_selector': self.item_selector,
+            'title_selector': self.title_selector,
+            'content_selector': self.content_selector,
+            'link_selector': self.link_selector,
+            'date_selector': self.date_selector,
+            'max_items': self.max_items,
+        }
+    
+    def clean(self):
+        from .extraction import CompiledRule, SelectorError
+        try:
+            CompiledRule(**self.selectors())
+        except SelectorError as e:
+            raise ValidationError({e.field: str(e)})
+
+
+class FetchState(models.Model):
+    """HTTP cache validators remembered from the last fetch of a monitored URL"""
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the last fetched body")
+    last_status = models.IntegerField(null=True, blank=True)
+    fetched_at = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(null=True, blank=True)
+    snapshot = models.ForeignKey(PageSnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    def __str__(self):
+        return f"Fetch state for {self.url}"
+
+
+
+class FeedKind(models.TextChoices):
+    RSS = 'rss', 'RSS'
+    ATOM = 'atom', 'Atom'
+    SITEMAP = 'sitemap', 'Sitemap'
+    SITEMAP_INDEX = 'sitemapindex', 'Sitemap index'
+
 
+class FeedSource(models.Model):
+    """An RSS/Atom feed or sitemap of a competitor, ingested incrementally from a cursor"""
+    competitor = models.ForeignKey(Competitor, on_delete=models.CASCADE, related_name='feeds')
+    url = models.URLField(max_length=500)
+    kind = models.CharField(max_length=20, choices=FeedKind.choices, blank=True)
+    is_verified = models.BooleanField(default=False, help_text="Discovered URLs are verified on their first fetch")
+    is_enabled = models.BooleanField(default=True)
+    last_guid = models.CharField(max_length=500, blank=True, help_text="GUID of the newest entry seen")
+    last_published = models.DateTimeField(null=True, blank=True, help_text="Newest entry date or lastmod seen")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = [['competitor', 'url']]
+    
+    def __str__(self):
+        return f"{self.get_kind_display() or 'Feed'} {self.url}"
@@ -0,0 +1,140 @@
+"""
+Per-host politeness: token-bucket rate limiting and a cached robots.txt parser
+"""
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity` tokens"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def try_acquire(self, now=None):
+        """Take a token if one is available; otherwise return the seconds until one is"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class HostRateLimiter:
+    """
+    Keeps one token bucket per host.
+
+    If a robots.txt Crawl-delay is known for a host, that host's bucket is
+    slowed down to honour it. Hosts are throttled independently, so a slow
+    or strict host never delays requests to other hosts.
+    """
+    
+    def __init__(self, rate=1.0, burst=2, robots=None):
+        self.rate = rate
+        self.burst = burst
+        self.robots = robots
+        self.buckets = {}
+    
+    def try_acquire(self, host):
+        """Return 0 if a request to host may start now, else the seconds to wait"""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        
+        crawl_delay = self.robots.cached_crawl_delay(host) if self.robots is not None else None
+        if crawl_delay and 1.0 / crawl_delay < bucket.rate:
+            bucket.rate = 1.0 / crawl_delay
+            bucket.capacity = 1
+            bucket.tokens = min(bucket.tokens, 1)
+        
+        return bucket.try_acquire()
+
+
+class RobotsCache:
+    """Thread-safe robots.txt cache with a time-to-live per host"""
+    
+    def __init__(self, user_agent='*', ttl=3600, timeout=10):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.timeout = timeout
+        self.entries = {}  # host -> (expires_at, RobotFileParser)
+        self.lock = threading.Lock()
+        self.host_locks = {}
+    
+    def allowed(self, url, session):
+        """Return True if robots.txt lets our user agent fetch url, downloading it with session if needed"""
+        return self._parser_for(url, session).can_fetch(self.user_agent, url)
+    
+    def cached_crawl_delay(self, host):
+        """Return the Crawl-delay for host if its robots.txt is already cached"""
+        entry = self.entries.get(host)
+        if entry is None:
+            return None
+        try:
+            delay = entry[1].crawl_delay(self.user_agent)
+            return float(delay) if delay else None
+        except (TypeError, ValueError):
+            return None
+    
+    def cached_sitemaps(self, host):
+        """Return the Sitemap URLs listed in host's robots.txt if it is already cached"""
+        entry = self.entries.get(host)
+        if entry is None:
+            return []
+        return entry[1].site_maps() or []
+    
+    def clear(self):
+        """Forget every cached robots.txt"""
+        with self.lock:
+            self.entries.clear()
+    
+    def _parser_for(self, url, session):
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        
+        entry = self.entries.get(host)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        # Only one thread per host downloads robots.txt; the others wait for it
+        with self.lock:
+            host_lock = self.host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            entry = self.entries.get(host)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            
+            robots_url = urlunsplit((parts.scheme, parts.netloc, '/robots.txt', '', ''))
+            parser = self._fetch(robots_url, session)
+            self.entries[host] = (time.monotonic() + self.ttl, parser)
+            return parser
+    
+    def _fetch(self, robots_url, session):
+        parser = RobotFileParser(robots_url)
+        try:
+            response = session.get(robots_url, timeout=self.timeout)
+        except Exception as e:
+            # An unreachable robots.txt shouldn't block monitoring; the page fetch will fail on its own
+            logger.warning(f"Could not fetch {robots_url}: {str(e)}")
+            parser.allow_all = True
+            return parser
+        
+        # Same status handling as RobotFileParser.read()
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(response.text.splitlines())
+        return parser
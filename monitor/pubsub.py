@@ -0,0 +1,157 @@
+"""
+Publish/subscribe used to push new notifications to connected clients
+"""
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from django.conf import settings
+from django.utils.module_loading import import_string
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def user_channel(user_id):
+    """Return the channel a user's notifications are published on"""
+    return f'notifications:{user_id}'
+
+
+class Subscription:
+    """
+    A subscriber's pending messages, read from the event loop that subscribed.
+
+    The queue is bounded so a stalled client can't hold an unbounded backlog;
+    once it overflows, further messages are dropped and `overflowed` is set,
+    and the reader is expected to disconnect and catch up from the database.
+    """
+    
+    def __init__(self, broker, channel, max_pending=100):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_pending)
+        self.overflowed = False
+    
+    def put(self, message):
+        """Queue a message; must be called on the subscription's event loop"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+    
+    async def get(self, timeout=None):
+        """Wait for the next message, raising asyncio.TimeoutError after timeout seconds"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+    
+    def close(self):
+        self.broker.unsubscribe(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Broker(ABC):
+    """
+    Interface for notification brokers.
+
+    Publishing is synchronous and safe to call from any thread, so the
+    monitoring code can publish without caring where subscribers run.
+    Subclasses that deliver across processes only need to implement
+    subscribe, unsubscribe and publish_many.
+    """
+    
+    @abstractmethod
+    def subscribe(self, channel):
+        """Return a Subscription receiving the messages published on channel"""
+    
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        """Stop delivering to a subscription"""
+    
+    def publish(self, channel, message):
+        self.publish_many([(channel, message)])
+    
+    @abstractmethod
+    def publish_many(self, messages):
+        """Publish an iterable of (channel, message) pairs"""
+
+
+class InProcessBroker(Broker):
+    """
+    Delivers messages to subscribers in the current process.
+
+    Subscribers wait on asyncio queues, so thousands of idle connections cost
+    a queue each rather than a thread. A batch of messages is handed to each
+    subscriber event loop with a single call_soon_threadsafe, however many
+    subscribers it reaches.
+    """
+    
+    def __init__(self, max_pending=None):
+        self.max_pending = max_pending or getattr(settings, 'MONITOR_STREAM_QUEUE_SIZE', 100)
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+    
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.max_pending)
+        with self.lock:
+            self.subscribers[channel].add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscribers[subscription.channel]
+    
+    def subscriber_count(self):
+        with self.lock:
+            return sum(len(subscribers) for subscribers in self.subscribers.values())
+    
+    def publish_many(self, messages):
+        by_loop = defaultdict(list)
+        with self.lock:
+            if not self.subscribers:
+                return
+            for channel, message in messages:
+                for subscription in self.subscribers.get(channel, ()):
+                    by_loop[subscription.loop].append((subscription, message))
+        
+        for loop, deliveries in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, deliveries)
+            except RuntimeError:
+                # The subscriber's loop has shut down; its subscriptions go with it
+                logger.debug("Dropped notifications for a closed event loop")
+
+
+def _deliver(deliveries):
+    for subscription, message in deliveries:
+        subscription.put(message)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker, built from the MONITOR_NOTIFICATION_BROKER setting"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'MONITOR_NOTIFICATION_BROKER', 'monitor.pubsub.InProcessBroker')
+                _broker = import_string(path)()
+    return _broker
+
+
+def set_broker(broker):
+    """Replace the process-wide broker, e.g. with a stand-in in tests; None rebuilds it from settings"""
+    global _broker
+    with _broker_lock:
+        _broker = broker
@@ -0,0 +1,143 @@
+"""
+Retention policies that delete or archive old rows in small transactions
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import ArchivedUpdate, CompetitorUpdate, Notification, UnreadNotificationCounter
+
+
+class RetentionPolicy(ABC):
+    """Selects the rows of one model older than max_age; subclasses say how a chunk of them is reclaimed"""
+    name = ''
+    fields = ('id',)
+    
+    def __init__(self, max_age):
+        self.max_age = max_age
+    
+    def cutoff(self, now=None):
+        return (now or timezone.now()) - self.max_age
+    
+    @abstractmethod
+    def expired(self, cutoff):
+        """Return a queryset of the rows the policy removes"""
+    
+    @abstractmethod
+    def reclaim(self, rows):
+        """Remove one chunk of expired rows and return {model label: rows deleted}"""
+
+
+class ReadNotificationPolicy(RetentionPolicy):
+    """Deletes notifications that were read and are older than max_age"""
+    name = 'read-notifications'
+    
+    def expired(self, cutoff):
+        return Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+    
+    def reclaim(self, rows):
+        return Notification.objects.filter(pk__in=[row.pk for row in rows]).delete()[1]
+
+
+class UpdateArchivePolicy(RetentionPolicy):
+    """
+    Moves updates detected before max_age ago into ArchivedUpdate.
+
+    Their SimHash bands, trend links and single notifications are deleted
+    with them; digests they led are led by another of their updates, and
+    users who lose unread notifications get their counters recounted.
+    """
+    name = 'archive-updates'
+    fields = (
+        'id', 'competitor_id', 'title', 'content', 'url', 'update_type', 'impact_score', 'is_high_impact',
+        'source', 'detected_at', 'published_date', 'fingerprint',
+    )
+    
+    def expired(self, cutoff):
+        return CompetitorUpdate.objects.filter(detected_at__lt=cutoff)
+    
+    def reclaim(self, rows):
+        pks = [row.pk for row in rows]
+        ArchivedUpdate.objects.bulk_create([ArchivedUpdate.from_update(row) for row in rows], ignore_conflicts=True)
+        updates = CompetitorUpdate.objects.filter(pk__in=pks)
+        Notification.relead_digests(updates)
+        user_ids = UnreadNotificationCounter.unread_user_ids(Notification.objects.filter(update_id__in=pks))
+        deleted = updates.delete()[1]
+        if user_ids:
+            UnreadNotificationCounter.recount(user_ids)
+        return deleted
+
+
+class RetentionReport:
+    """Rows matched and reclaimed by one policy run"""
+    
+    def __init__(self, policy, cutoff):
+        self.policy = policy
+        self.cutoff = cutoff
+        self.matched = 0
+        self.reclaimed = Counter()
+        self.chunks = 0
+        self.seconds = 0.0
+    
+    def __str__(self):
+        rate = self.matched / self.seconds if self.seconds else 0
+        summary = (
+            f"{self.policy.name}: {self.matched} rows older than {self.cutoff:%Y-%m-%d %H:%M} "
+            f"in {self.chunks} chunks, {self.seconds:.1f}s ({rate:.0f} rows/s)"
+        )
+        if self.reclaimed:
+            details = ', '.join(f"{label} {count}" for label, count in sorted(self.reclaimed.items()))
+            summary += f"; reclaimed {sum(self.reclaimed.values())} rows ({details})"
+        return summary
+
+
+def default_policies():
+    """Return the policies enabled by the MONITOR_RETENTION_* settings"""
+    policies = []
+    days = getattr(settings, 'MONITOR_RETENTION_READ_NOTIFICATION_DAYS', 30)
+    if days:
+        policies.append(ReadNotificationPolicy(timedelta(days=days)))
+    months = getattr(settings, 'MONITOR_RETENTION_ARCHIVE_UPDATE_MONTHS', 12)
+    if months:
+        policies.append(UpdateArchivePolicy(relativedelta(months=months)))
+    return policies
+
+
+def run_policy(policy, chunk_size=500, pause=0, dry_run=False, now=None, progress=None):
+    """
+    Apply a policy chunk by chunk and return a RetentionReport.
+
+    Each chunk is selected by primary key after the previous one and
+    reclaimed in its own short transaction, so concurrent writers are
+    only ever blocked for one chunk; pause sleeps between chunks to give
+    them more room. With dry_run, expired rows are counted but kept.
+    """
+    report = RetentionReport(policy, policy.cutoff(now))
+    expired = policy.expired(report.cutoff).order_by('pk').only(*policy.fields)
+    started = time.monotonic()
+    last_pk = None
+    
+    while True:
+        rows = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+        chunk = list(rows[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        report.matched += len(chunk)
+        report.chunks += 1
+        
+        if not dry_run:
+            with transaction.atomic():
+                report.reclaimed.update(policy.reclaim(chunk))
+            if pause:
+                time.sleep(pause)
+        report.seconds = time.monotonic() - started
+        if progress is not None:
+            progress(report)
+    
+    report.seconds = time.monotonic() - started
+    return report
@@ -31,13 +31,30 @@ class TrendSerializer(serializers.ModelSerializer):
                   'first_detected', 'last_detected', 'confidence_score', 'related_updates_count']
 
 
+class DigestUpdateSerializer(serializers.ModelSerializer):
+    competitor_name = serializers.CharField(source='competitor.name', read_only=True)
+    
+    class Meta:
+        model = CompetitorUpdate
+        fields = ['id', 'title', 'competitor_name', 'update_type', 'impact_score', 'url', 'detected_at']
+
+
 class NotificationSerializer(serializers.ModelSerializer):
-    update_title = serializers.CharField(source='update.title', read_only=True)
-    competitor_name = serializers.CharField(source='update.competitor.name', read_only=True)
+    # A digest whose updates were all deleted has no lead update
+    update_title = serializers.CharField(source='update.title', read_only=True, allow_null=True)
+    competitor_name = serializers.CharField(source='update.competitor.name', read_only=True, allow_null=True)
+    update_count = serializers.IntegerField(read_only=True)
+    updates = serializers.SerializerMethodField()
     
     class Meta:
         model = Notification
-        fields = ['id', 'update_title', 'competitor_name', 'message', 'is_read', 'created_at']
+        fields = ['id', 'update_title', 'competitor_name', 'message', 'is_read', 'created_at',
+                  'is_digest', 'window_start', 'update_count', 'updates']
+    
+    def get_updates(self, obj):
+        if not hasattr(obj, 'digest_updates'):
+            Notification.attach_updates([obj])
+        return DigestUpdateSerializer(obj.digest_updates, many=True).data
 
 
 class MonitoringConfigSerializer(serializers.ModelSerializer):
@@ -46,7 +63,8 @@ class MonitoringConfigSerializer(serializers.ModelSerializer):
     class Meta:
         model = MonitoringConfig
         fields = ['id', 'competitor_name', 'check_interval_hours', 'is_enabled',
-                  'last_checked', 'keywords']
+                  'last_checked', 'keywords', 'breaker_state', 'consecutive_failures',
+                  'last_failure_at', 'backoff_until', 'avg_latency_ms', 'near_duplicate_threshold']
 
 
 class DashboardStatsSerializer(serializers.Serializer):
@@ -1,208 +1,1007 @@
 """
 Service layer for monitoring and analyzing competitor data
 """
+import gzip
+import hashlib
+import time
+from collections import defaultdict
 import requests
-from bs4 import BeautifulSoup
-import re
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count, Q
-from .models import Competitor, CompetitorUpdate, UpdateType, Trend, Notification, MonitoringConfig
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Sum
+from .models import (
+    Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig, FetchState,
+    ExtractionRule, BreakerState, PageSnapshot, FeedSource, FeedKind, SimHashBand, UnreadNotificationCounter,
+    ArchivedUpdate, DailyUpdateRollup
+)
+from .crawler import CrawlScheduler, host_for
+from .extraction import HeuristicExtractor, extract_candidates, get_compiled_rule, FEED_CHUNK_SIZE
+from .classification import (
+    classify, default_matcher, impact_score_for, get_keyword_matcher, watched_keywords, boosted_score
+)
+from .dedup import fingerprint, simhash, similarity, band_keys, to_signed, from_signed, NEAR_DUPLICATE_THRESHOLD
+from .feeds import find_feed_links, feed_candidates, parse_feed, select_new_entries
+from .workers import create_pool, parse_page_task
+from .politeness import HostRateLimiter, RobotsCache
+from .pubsub import get_broker, user_channel
+from .trend_engine import SeriesSet, detect_spikes
 import logging
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Shared by every monitoring run in this process so the TTL spans runs
+robots_cache = RobotsCache(user_agent=USER_AGENT, ttl=getattr(settings, 'MONITOR_ROBOTS_TTL', 3600))
+
 
 class CompetitorMonitor:
     """Main service for monitoring competitor websites"""
     
-    def __init__(self):
+    def __init__(self, max_workers=None, max_per_host=None, parse_workers=None):
+        self.max_workers = max_workers or getattr(settings, 'MONITOR_MAX_WORKERS', 8)
+        self.max_per_host = max_per_host or getattr(settings, 'MONITOR_MAX_PER_HOST', 2)
+        if parse_workers is None:
+            parse_workers = getattr(settings, 'MONITOR_PARSE_WORKERS', 0)
+        self.parse_workers = parse_workers
+        self.host_rate = getattr(settings, 'MONITOR_HOST_RATE', 1.0)
+        self.host_burst = getattr(settings, 'MONITOR_HOST_BURST', 2)
+        self.respect_robots = getattr(settings, 'MONITOR_RESPECT_ROBOTS', True)
+        self.breaker_threshold = getattr(settings, 'MONITOR_BREAKER_THRESHOLD', 3)
+        self.backoff_base = timedelta(minutes=getattr(settings, 'MONITOR_BACKOFF_BASE_MINUTES', 30))
+        self.backoff_max = timedelta(hours=getattr(settings, 'MONITOR_BACKOFF_MAX_HOURS', 24))
+        self.feed_max_items = getattr(settings, 'MONITOR_FEED_MAX_ITEMS', 20)
+        self.feed_discovery_interval = timedelta(days=getattr(settings, 'MONITOR_FEED_DISCOVERY_DAYS', 7))
+        self.persist_chunk_size = getattr(settings, 'MONITOR_PERSIST_CHUNK_SIZE', 500)
+        self.notify_recipients = getattr(settings, 'MONITOR_NOTIFY_RECIPIENTS', 'all')
+        self.notification_chunk_size = getattr(settings, 'MONITOR_NOTIFICATION_CHUNK_SIZE', 1000)
+        self.digest_minutes = getattr(settings, 'MONITOR_NOTIFICATION_DIGEST_MINUTES', 0)
+        self.spike_detection = getattr(settings, 'MONITOR_SPIKE_DETECTION', True)
+        self.max_page_bytes = getattr(settings, 'MONITOR_MAX_PAGE_BYTES', 2 * 1024 * 1024)
+        self.allowed_content_types = set(getattr(settings, 'MONITOR_ALLOWED_CONTENT_TYPES', [
+            'text/html', 'application/xhtml+xml', 'text/xml', 'application/xml',
+            'application/rss+xml', 'application/atom+xml', 'application/rdf+xml',
+        ]))
+        
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         })
+        # Size the connection pool so concurrent fetches don't discard connections
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
-    def scrape_competitor_website(self, competitor):
-        """Scrape updates from a competitor's website"""
-        try:
-            response = self.session.get(competitor.website, timeout=10)
+    def fetch_page(self, url, fetch_state=None, extractor=None):
+        """
+        Fetch a page with a conditional GET using validators from the previous fetch.
+
+        The body is streamed and read up to max_page_bytes. With an extractor,
+        each chunk is fed to it as it arrives and parsing stops as soon as the
+        extractor's result is settled; the rest of the body is still read so
+        the hash and the archived snapshot cover the whole page.
+        """
+        headers = {}
+        if fetch_state is not None:
+            if fetch_state.etag:
+                headers['If-None-Match'] = fetch_state.etag
+            if fetch_state.last_modified:
+                headers['If-Modified-Since'] = fetch_state.last_modified
+        
+        with self.session.get(url, timeout=10, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                return {
+                    'url': url,
+                    'status_code': 304,
+                    'etag': response.headers.get('ETag', fetch_state.etag),
+                    'last_modified': response.headers.get('Last-Modified', fetch_state.last_modified),
+                    'content_hash': fetch_state.content_hash,
+                    'changed': False,
+                    'content': None,
+                    'complete': True,
+                }
+            
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type and content_type not in self.allowed_content_types:
+                raise ValueError(f"Unsupported content type '{content_type}'")
             
-            # Extract potential updates (this is a simplified version)
-            # In production, you'd customize this per competitor
-            updates = []
+            content, complete = self.read_body(response, extractor)
+        
+        content_hash = hashlib.sha256(content).hexdigest()
+        return {
+            'url': url,
+            'status_code': response.status_code,
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            'content_hash': content_hash,
+            # Servers without validators still let us skip parsing identical bodies
+            'changed': fetch_state is None or content_hash != fetch_state.content_hash,
+            'content': content,
+            'complete': complete,
+        }
+    
+    def read_body(self, response, extractor=None):
+        """Read a streamed body up to the byte cap; returns (content, complete), complete being False if capped"""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=FEED_CHUNK_SIZE):
+            chunk = chunk[:self.max_page_bytes - size]
+            chunks.append(chunk)
+            size += len(chunk)
             
-            # Look for common patterns: headings, article titles, etc.
-            headings = soup.find_all(['h1', 'h2', 'h3', 'h4'])
-            articles = soup.find_all(['article', 'div'], class_=re.compile(r'post|article|news|update', re.I))
+            if extractor is not None:
+                # A settled extractor ignores further chunks, so this only costs the read
+                extractor.feed(chunk)
+            if size >= self.max_page_bytes:
+                logger.warning(f"Truncated {response.url} at {size} bytes")
+                return b''.join(chunks), False
+        
+        return b''.join(chunks), True
+    
+    def rule_spec(self, rule):
+        """Return a picklable (key, version, selectors) description of an extraction rule"""
+        if rule is None or not rule.is_enabled:
+            return None
+        return (rule.competitor_id, rule.updated_at, rule.selectors())
+    
+    def extract_updates(self, base_url, content, rule_spec=None, extractor=None):
+        """Extract candidate updates from a competitor's page content, or from an extractor it was streamed into"""
+        if rule_spec is not None:
+            key, version, selectors = rule_spec
+            return get_compiled_rule(key, version, **selectors).extract(content, base_url)
+        
+        # Generic heading/article heuristics; parsing stops once 5 candidates are settled
+        texts = extractor.close() if extractor is not None else extract_candidates(content, limit=5)
+        return [
+            {
+                'title': text[:200],
+                'content': text[:1000],
+                'url': base_url
+            }
+            for text in texts
+        ]
+    
+    def parse_page(self, base_url, content, rule_spec=None, extractor=None):
+        """Extract and classify the updates on a fetched page"""
+        return self.classify_updates(self.extract_updates(base_url, content, rule_spec, extractor))
+    
+    def classify_updates(self, updates):
+        """Add update_type and impact_score to extracted update dicts"""
+        for update_data in updates:
+            # One keyword scan yields both the category and the impact features
+            update_data['update_type'], update_data['impact_score'] = classify(
+                update_data['title'], update_data['content']
+            )
+        return updates
+    
+    def fetch_competitor(self, competitor, fetch_state=None, rule=None, parse=True, discover=False):
+        """
+        Fetch a competitor's website and parse it unless the page is unchanged.
+
+        With discover, the page is fetched even if unchanged so the feeds it
+        links to can be collected, along with any sitemaps in robots.txt.
+        """
+        result = {'updates': [], 'page': None, 'error': None, 'skipped': None, 'elapsed': None, 'feed_links': None}
+        try:
+            if self.respect_robots and not robots_cache.allowed(competitor.website, self.session):
+                logger.info(f"Skipping {competitor.website}: disallowed by robots.txt")
+                result['skipped'] = 'robots'
+                return result
             
-            for element in headings[:10] + articles[:10]:
-                text = element.get_text(strip=True)
-                if text and len(text) > 20:
-                    updates.append({
-                        'title': text[:200],
-                        'content': text[:1000],
-                        'url': competitor.website
-                    })
+            # Heuristic extraction runs on the body as it downloads and stops parsing once settled,
+            # unless a known hash may show the body unchanged; then it is parsed after the comparison
+            rule_spec = self.rule_spec(rule)
+            streamed = parse and rule_spec is None and not (fetch_state is not None and fetch_state.content_hash)
+            extractor = HeuristicExtractor(limit=5) if streamed else None
             
-            return updates[:5]  # Limit to 5 updates per check
+            started = time.monotonic()
+            result['page'] = self.fetch_page(competitor.website, None if discover else fetch_state, extractor)
+            result['elapsed'] = time.monotonic() - started
             
         except Exception as e:
             logger.error(f"Error scraping {competitor.website}: {str(e)}")
-            return []
-    
-    def classify_update(self, title, content):
-        """Classify an update based on keywords and content"""
-        text = (title + " " + content).lower()
+            result['error'] = str(e)
+            return result
         
-        # Pricing keywords
-        pricing_keywords = ['price', 'pricing', 'cost', '$', 'discount', 'sale', 'deal', 'offer', 'promotion']
-        if any(keyword in text for keyword in pricing_keywords):
-            return UpdateType.PRICING
+        page = result['page']
+        if discover:
+            page['changed'] = fetch_state is None or page['content_hash'] != fetch_state.content_hash
+            try:
+                links = find_feed_links(page['content'], competitor.website)
+            except Exception as e:
+                logger.error(f"Error discovering feeds on {competitor.website}: {str(e)}")
+                links = []
+            sitemaps = robots_cache.cached_sitemaps(host_for(competitor.website)) if self.respect_robots else []
+            result['feed_links'] = feed_candidates(competitor.website, links, sitemaps)
         
-        # Campaign keywords
-        campaign_keywords = ['campaign', 'launch', 'advertising', 'marketing', 'promote', 'announce']
-        if any(keyword in text for keyword in campaign_keywords):
-            return UpdateType.CAMPAIGN
+        if page['changed']:
+            # Compress off the main thread in case the body needs a new snapshot
+            page['compressed'] = gzip.compress(page['content'])
         
-        # Release keywords
-        release_keywords = ['release', 'launch', 'new product', 'introducing', 'unveil', 'debut']
-        if any(keyword in text for keyword in release_keywords):
-            return UpdateType.RELEASE
+        if page['changed'] and parse:
+            try:
+                result['updates'] = self.parse_page(competitor.website, page['content'], rule_spec, extractor)
+            except Exception as e:
+                logger.error(f"Error parsing {competitor.website}: {str(e)}")
+        
+        return result
+    
+    def fetch_feed(self, feed, fetch_state=None):
+        """Fetch a feed or sitemap and return the entries that are newer than its cursor"""
+        result = {
+            'updates': [], 'page': None, 'error': None, 'skipped': None, 'elapsed': None,
+            'kind': None, 'cursor': None,
+        }
+        try:
+            if self.respect_robots and not robots_cache.allowed(feed.url, self.session):
+                logger.info(f"Skipping {feed.url}: disallowed by robots.txt")
+                result['skipped'] = 'robots'
+                return result
+            
+            started = time.monotonic()
+            page = result['page'] = self.fetch_page(feed.url, fetch_state)
+            result['elapsed'] = time.monotonic() - started
+            
+        except Exception as e:
+            logger.error(f"Error fetching feed {feed.url}: {str(e)}")
+            result['error'] = str(e)
+            return result
         
-        # Partnership keywords
-        partnership_keywords = ['partnership', 'partner', 'collaboration', 'alliance', 'joint']
-        if any(keyword in text for keyword in partnership_keywords):
-            return UpdateType.PARTNERSHIP
+        if not page['changed']:
+            result['kind'] = feed.kind or None
+            return result
         
-        # Feature keywords
-        feature_keywords = ['feature', 'update', 'improvement', 'enhancement', 'new functionality']
-        if any(keyword in text for keyword in feature_keywords):
-            return UpdateType.FEATURE
+        try:
+            kind, entries = parse_feed(page['content'], feed.url)
+            if kind is None:
+                return result
+            new_entries, last_guid, last_published = select_new_entries(
+                kind, entries, feed.last_guid, feed.last_published, self.feed_max_items
+            )
+            result['kind'] = kind
+            result['cursor'] = (last_guid, last_published)
+            if kind == FeedKind.SITEMAP_INDEX:
+                # Child sitemaps become feeds of their own instead of updates
+                result['sitemaps'] = [entry['url'] for entry in new_entries]
+            else:
+                for entry in new_entries:
+                    entry['source'] = 'sitemap' if kind == FeedKind.SITEMAP else 'feed'
+                result['updates'] = self.classify_updates(new_entries)
+        except Exception as e:
+            logger.error(f"Error parsing feed {feed.url}: {str(e)}")
         
-        return UpdateType.OTHER
+        return result
     
-    def calculate_impact_score(self, title, content, update_type):
-        """Calculate impact score (0-100) for an update"""
-        score = 0
-        text = (title + " " + content).lower()
-        
-        # High-impact keywords
-        high_impact_keywords = ['launch', 'new', 'breakthrough', 'major', 'significant', 'revolutionary']
-        score += sum(10 for keyword in high_impact_keywords if keyword in text)
-        
-        # Type-based scoring
-        type_scores = {
-            UpdateType.PRICING: 30,
-            UpdateType.RELEASE: 40,
-            UpdateType.CAMPAIGN: 25,
-            UpdateType.PARTNERSHIP: 35,
-            UpdateType.FEATURE: 20,
-        }
-        score += type_scores.get(update_type, 10)
+    def scrape_competitor_website(self, competitor, fetch_state=None, rule=None):
+        """Scrape updates from a competitor's website"""
+        return self.fetch_competitor(competitor, fetch_state, rule)['updates']
+    
+    def get_fetch_states(self, urls):
+        """Return a dict of url -> FetchState, with unsaved instances for new URLs"""
+        states = {state.url: state for state in FetchState.objects.filter(url__in=urls)}
+        for url in urls:
+            if url not in states:
+                states[url] = FetchState(url=url)
+        return states
+    
+    def store_snapshot(self, page):
+        """Archive a changed page body, storing each distinct body only once"""
+        if page is None or not page['changed']:
+            return None
         
-        # Length-based (longer content might be more important)
-        if len(content) > 500:
-            score += 10
+        snapshot = PageSnapshot.objects.filter(content_hash=page['content_hash']).first()
+        if snapshot is None:
+            snapshot = PageSnapshot.objects.create(
+                content_hash=page['content_hash'],
+                url=page['url'],
+                size=len(page['content']),
+                truncated=not page['complete'],
+                data=page.get('compressed') or gzip.compress(page['content'])
+            )
+        return snapshot
+    
+    def update_fetch_state(self, fetch_state, page, snapshot=None):
+        """Remember the validators of a successful fetch for the next conditional GET; returns True if set"""
+        if page is None:
+            return False
         
-        return min(score, 100)
+        now = timezone.now()
+        fetch_state.etag = page['etag'] or ''
+        fetch_state.last_modified = page['last_modified'] or ''
+        fetch_state.content_hash = page['content_hash']
+        fetch_state.last_status = page['status_code']
+        fetch_state.fetched_at = now
+        if page['changed']:
+            fetch_state.changed_at = now
+        if snapshot is not None:
+            fetch_state.snapshot = snapshot
+        return True
     
-    def check_competitor(self, competitor):
-        """Check a single competitor for updates"""
-        config = MonitoringConfig.objects.filter(competitor=competitor).first()
+    def save_fetch_states(self, fetch_states):
+        """Write updated fetch states with one bulk insert and one bulk update"""
+        unique = list({id(state): state for state in fetch_states}.values())
+        with transaction.atomic():
+            FetchState.objects.bulk_create([state for state in unique if state.pk is None], ignore_conflicts=True)
+            FetchState.objects.bulk_update(
+                [state for state in unique if state.pk is not None],
+                ['etag', 'last_modified', 'content_hash', 'last_status', 'fetched_at', 'changed_at', 'snapshot'],
+                batch_size=self.persist_chunk_size
+            )
+    
+    def classify_update(self, title, content):
+        """Classify an update based on keywords and content"""
+        return classify(title, content)[0]
+    
+    def calculate_impact_score(self, title, content, update_type):
+        """Calculate impact score (0-100) for an update"""
+        found = default_matcher().match(f"{title} {content}")
+        return impact_score_for(found, content, update_type)
+    
+    def is_due(self, config):
+        """Return True if a competitor's monitoring config says it should be checked now"""
         if not config or not config.is_enabled:
-            return []
+            return False
         
-        # Check if it's time to check
         if config.last_checked:
             time_since_check = timezone.now() - config.last_checked
             if time_since_check < timedelta(hours=config.check_interval_hours):
-                return []
+                return False
         
-        updates_data = self.scrape_competitor_website(competitor)
-        new_updates = []
+        return True
+    
+    def apply_keywords(self, config, updates_data):
+        """
+        Keep only the updates that mention one of a config's watched keywords, boosting their impact.
+
+        Updates pass through unchanged when the config has no keywords. Items
+        dropped here never reach deduplication, the database or notifications.
+        """
+        matcher = get_keyword_matcher(config.pk, config.keywords) if config is not None else None
+        if matcher is None:
+            return updates_data
         
+        relevant = []
         for update_data in updates_data:
-            # Check if update already exists
-            existing = CompetitorUpdate.objects.filter(
-                competitor=competitor,
-                title__icontains=update_data['title'][:50]
-            ).first()
+            found = watched_keywords(matcher, update_data['title'], update_data['content'])
+            if not found:
+                continue
+            update_data = dict(update_data)
+            if update_data.get('impact_score') is None:
+                update_data['update_type'], update_data['impact_score'] = classify(
+                    update_data['title'], update_data['content']
+                )
+            update_data['impact_score'] = boosted_score(update_data['impact_score'], found)
+            relevant.append(update_data)
+        return relevant
+    
+    def find_near_duplicates(self, competitor, signatures, threshold):
+        """
+        Return the keys of signatures that repeat an earlier update of the competitor.
+
+        signatures maps candidate keys to SimHash signatures. Candidates sharing
+        an LSH band with a stored update, or with an earlier candidate, are
+        compared bit by bit, so the lookup only touches a small fraction of the
+        competitor's history.
+        """
+        if threshold is None:
+            threshold = NEAR_DUPLICATE_THRESHOLD
+        if threshold >= 1 or not signatures:
+            return set()
+        
+        keys = {key: band_keys(signature) for key, signature in signatures.items()}
+        known = defaultdict(list)
+        rows = SimHashBand.objects.filter(
+            competitor=competitor,
+            key__in={band for bands in keys.values() for band in bands}
+        ).values_list('key', 'update__simhash')
+        for band, stored in rows:
+            known[band].append(from_signed(stored))
+        
+        duplicates = set()
+        for key, signature in signatures.items():
+            if any(similarity(signature, other) >= threshold for band in keys[key] for other in known[band]):
+                duplicates.add(key)
+                continue
+            for band in keys[key]:
+                known[band].append(signature)
+        return duplicates
+    
+    def store_new_updates(self, competitor, updates_data, snapshot=None, threshold=None):
+        """Create CompetitorUpdate rows for the scraped updates a competitor doesn't have yet"""
+        return self.persist_updates(self.build_updates(competitor, [(updates_data, snapshot)], threshold))
+    
+    def build_updates(self, competitor, batches, threshold=None):
+        """
+        Return unsaved CompetitorUpdate instances for the scraped updates a competitor doesn't have yet.
+
+        batches is a list of (updates_data, snapshot) pairs, so updates from the
+        competitor's page and feeds are deduplicated against each other too.
+        """
+        # One indexed IN query finds every candidate the competitor already has
+        candidates = {}
+        for updates_data, snapshot in batches:
+            for update_data in updates_data:
+                candidates.setdefault(fingerprint(update_data['title']), (update_data, snapshot))
+        existing = set(
+            CompetitorUpdate.objects.filter(competitor=competitor, fingerprint__in=list(candidates))
+            .order_by().values_list('fingerprint', flat=True)
+        )
+        unseen = [update_fingerprint for update_fingerprint in candidates if update_fingerprint not in existing]
+        if unseen:
+            # Updates moved to the archive by the retention job still count as seen
+            existing.update(
+                ArchivedUpdate.objects.filter(competitor=competitor, fingerprint__in=unseen)
+                .order_by().values_list('fingerprint', flat=True)
+            )
+        
+        # Reworded repeats of earlier updates are found through the SimHash band index. Only titles are
+        # signed: the same item often comes with a feed description on one source and none on another
+        signatures = {
+            update_fingerprint: simhash(update_data['title'])
+            for update_fingerprint, (update_data, _) in candidates.items()
+            if update_fingerprint not in existing
+        }
+        existing |= self.find_near_duplicates(competitor, signatures, threshold)
+        
+        new_updates = []
+        
+        for update_fingerprint, (update_data, snapshot) in candidates.items():
+            if update_fingerprint in existing:
+                continue
             
-            if not existing:
+            update_type = update_data.get('update_type')
+            if update_type is None:
                 update_type = self.classify_update(update_data['title'], update_data['content'])
+            impact_score = update_data.get('impact_score')
+            if impact_score is None:
                 impact_score = self.calculate_impact_score(
                     update_data['title'], 
                     update_data['content'], 
                     update_type
                 )
-                
-                update = CompetitorUpdate.objects.create(
-                    competitor=competitor,
-                    title=update_data['title'],
-                    content=update_data['content'],
-                    url=update_data.get('url', competitor.website),
-                    update_type=update_type,
-                    impact_score=impact_score,
-                    is_high_impact=impact_score >= 60,
-                    source='website'
-                )
-                new_updates.append(update)
-        
-        # Update last checked time
-        if config:
-            config.last_checked = timezone.now()
-            config.save()
+            
+            new_updates.append(CompetitorUpdate(
+                competitor=competitor,
+                title=update_data['title'],
+                content=update_data['content'],
+                url=update_data.get('url') or competitor.website,
+                published_date=update_data.get('published_date'),
+                update_type=update_type,
+                impact_score=impact_score,
+                is_high_impact=impact_score >= 60,
+                source=update_data.get('source', 'website'),
+                snapshot=snapshot,
+                fingerprint=update_fingerprint,
+                simhash=to_signed(signatures[update_fingerprint])
+            ))
         
         return new_updates
     
+    def persist_updates(self, updates):
+        """
+        Insert new updates and their SimHash bands with one transaction per chunk.
+
+        Returns the updates that were stored, with primary keys set. If another
+        run stored some of the same updates first, the chunk is retried row by
+        row and the conflicting rows are left out.
+        """
+        stored = []
+        for start in range(0, len(updates), self.persist_chunk_size):
+            chunk = updates[start:start + self.persist_chunk_size]
+            try:
+                with transaction.atomic():
+                    CompetitorUpdate.objects.bulk_create(chunk)
+                    SimHashBand.objects.bulk_create(self.simhash_bands(chunk))
+                    DailyUpdateRollup.record(chunk)
+                stored.extend(chunk)
+            except IntegrityError:
+                for update in chunk:
+                    update.pk = None
+                    try:
+                        with transaction.atomic():
+                            update.save(force_insert=True)
+                            SimHashBand.objects.bulk_create(self.simhash_bands([update]))
+                        stored.append(update)
+                    except IntegrityError:
+                        logger.info(f"Skipping update stored concurrently: {update.title[:50]}")
+        return stored
+    
+    def simhash_bands(self, updates):
+        """Return the SimHashBand rows indexing saved updates"""
+        return [
+            SimHashBand(update=update, competitor_id=update.competitor_id, key=key)
+            for update in updates
+            for key in band_keys(from_signed(update.simhash))
+        ]
+    
+    def save_configs(self, configs):
+        """Write the check times and circuit breaker state of monitored competitors in one bulk update"""
+        MonitoringConfig.objects.bulk_update(configs, [
+            'last_checked', 'breaker_state', 'consecutive_failures', 'last_failure_at', 'last_error',
+            'backoff_until', 'avg_latency_ms', 'feeds_discovered_at',
+        ], batch_size=self.persist_chunk_size)
+    
+    def breaker_allows(self, config):
+        """Return False while a competitor's circuit breaker is open and backing off"""
+        if config.breaker_state != BreakerState.OPEN:
+            return True
+        
+        if config.backoff_until and config.backoff_until > timezone.now():
+            return False
+        
+        # Backoff elapsed: let a single trial fetch through
+        config.breaker_state = BreakerState.HALF_OPEN
+        return True
+    
+    def record_fetch_outcome(self, config, result):
+        """Track failures and latency for a competitor and trip or reset its circuit breaker"""
+        if result['skipped']:
+            return
+        
+        if result['error'] is None:
+            latency_ms = result['elapsed'] * 1000
+            if config.avg_latency_ms is None:
+                config.avg_latency_ms = latency_ms
+            else:
+                config.avg_latency_ms = 0.8 * config.avg_latency_ms + 0.2 * latency_ms
+            config.consecutive_failures = 0
+            config.breaker_state = BreakerState.CLOSED
+            config.backoff_until = None
+            return
+        
+        now = timezone.now()
+        config.consecutive_failures += 1
+        config.last_failure_at = now
+        config.last_error = result['error'][:255]
+        
+        # A failed trial re-opens the breaker immediately, with a longer backoff
+        if config.breaker_state == BreakerState.HALF_OPEN or config.consecutive_failures >= self.breaker_threshold:
+            exponent = max(config.consecutive_failures - self.breaker_threshold, 0)
+            backoff = min(self.backoff_base * (2 ** exponent), self.backoff_max)
+            config.breaker_state = BreakerState.OPEN
+            config.backoff_until = now + backoff
+            logger.warning(
+                f"Circuit open for {config.competitor.website} after "
+                f"{config.consecutive_failures} failures; retrying after {config.backoff_until}"
+            )
+    
+    def discovery_due(self, config):
+        """Return True if a competitor's site should be searched for feeds and sitemaps again"""
+        return (
+            config.feeds_discovered_at is None
+            or timezone.now() - config.feeds_discovered_at >= self.feed_discovery_interval
+        )
+    
+    def add_feed_candidates(self, competitor, urls):
+        """Record discovered feed URLs; each one is verified the first time it is fetched"""
+        known = set(FeedSource.objects.filter(competitor=competitor).values_list('url', flat=True))
+        FeedSource.objects.bulk_create([
+            FeedSource(competitor=competitor, url=url[:500])
+            for url in dict.fromkeys(urls) if url[:500] not in known
+        ])
+    
+    def save_feed_result(self, feed, result):
+        """
+        Advance a feed's cursor after a fetch.
+
+        Returns False if the result should not count towards the competitor's
+        fetch outcome: discovered URLs that turn out not to be feeds are dropped
+        rather than tripping the circuit breaker.
+        """
+        if result['skipped']:
+            return False
+        
+        if result['error'] is not None or result['kind'] is None:
+            if not feed.is_verified:
+                feed.delete()
+                return False
+            if result['error'] is None:
+                result['error'] = f"{feed.url} is no longer a feed"
+            return True
+        
+        feed.kind = result['kind']
+        feed.is_verified = True
+        if result['cursor'] is not None:
+            feed.last_guid, feed.last_published = result['cursor']
+        feed.save()
+        
+        if result.get('sitemaps'):
+            self.add_feed_candidates(feed.competitor, result['sitemaps'])
+        return True
+    
+    def feed_outcome(self, feed_results):
+        """Combine the fetches of a competitor's feeds into one result for its circuit breaker"""
+        failed = [result for result in feed_results if result['error'] is not None]
+        elapsed = [result['elapsed'] for result in feed_results if result['error'] is None]
+        return {
+            'updates': [],
+            'page': None,
+            'error': failed[0]['error'] if feed_results and len(failed) == len(feed_results) else None,
+            'skipped': None if feed_results else 'no feeds',
+            'elapsed': max(elapsed) if elapsed else None,
+        }
+    
+    def check_competitor(self, competitor):
+        """Check a single competitor for updates"""
+        return self.check_competitors([competitor])
+    
     def check_all_competitors(self):
-        """Check all active competitors"""
-        competitors = Competitor.objects.filter(is_active=True)
-        all_new_updates = []
+        """Check all active competitors, fetching concurrently and parsing in worker processes"""
+        all_new_updates = self.check_competitors(list(Competitor.objects.filter(is_active=True)))
+        
+        # Create notifications for high-impact updates
+        self.notify_updates([update for update in all_new_updates if update.is_high_impact])
         
-        for competitor in competitors:
+        if self.spike_detection and all_new_updates:
             try:
-                updates = self.check_competitor(competitor)
-                all_new_updates.extend(updates)
+                TrendAnalyzer().detect_spikes()
+            except Exception as e:
+                logger.error(f"Error detecting trend spikes: {str(e)}")
+        
+        return all_new_updates
+    
+    def check_competitors(self, competitors):
+        """
+        Check the given competitors that are due and return their new updates.
+
+        Competitors with a verified feed or sitemap are read from it; their
+        HTML page is only scraped when they have none yet, or when an
+        extraction rule asks for it explicitly.
+        """
+        configs = {
+            config.competitor_id: config
+            for config in MonitoringConfig.objects.filter(competitor__in=competitors).select_related('competitor')
+        }
+        due = [c for c in competitors if self.is_due(configs.get(c.pk))]
+        open_breakers = [c for c in due if not self.breaker_allows(configs[c.pk])]
+        if open_breakers:
+            logger.info(f"Skipping {len(open_breakers)} competitors with open circuit breakers")
+            due = [c for c in due if c not in open_breakers]
+        feeds = defaultdict(list)
+        for feed in FeedSource.objects.filter(competitor__in=due, is_enabled=True).select_related('competitor'):
+            feeds[feed.competitor_id].append(feed)
+        rules = {
+            rule.competitor_id: rule
+            for rule in ExtractionRule.objects.filter(competitor__in=due, is_enabled=True)
+        }
+        scraped = {
+            c.pk for c in due
+            if c.pk in rules or not any(feed.is_verified for feed in feeds[c.pk])
+        }
+        fetch_states = self.get_fetch_states(
+            [c.website for c in due if c.pk in scraped] + [feed.url for c in due for feed in feeds[c.pk]]
+        )
+        
+        # Network I/O runs on the worker pool; DB writes stay on this thread
+        rate_limiter = HostRateLimiter(
+            rate=self.host_rate,
+            burst=self.host_burst,
+            robots=robots_cache if self.respect_robots else None
+        )
+        scheduler = CrawlScheduler(
+            max_workers=self.max_workers,
+            max_per_host=self.max_per_host,
+            rate_limiter=rate_limiter
+        )
+        jobs = []
+        for c in due:
+            if c.pk in scraped:
+                jobs.append({
+                    'key': c.pk,
+                    'url': c.website,
+                    'competitor': c,
+                    'fetch_state': fetch_states[c.website],
+                    'rule': rules.get(c.pk),
+                    'discover': self.discovery_due(configs[c.pk]),
+                })
+            for feed in feeds[c.pk]:
+                jobs.append({
+                    'key': ('feed', feed.pk),
+                    'url': feed.url,
+                    'feed': feed,
+                    'fetch_state': fetch_states[feed.url],
+                })
+        
+        # CPU-bound parsing moves to a process pool when one is configured
+        parse_pool = create_pool(self.parse_workers) if self.parse_workers > 0 and scraped else None
+        parse_futures = {}
+        
+        # Hosts that keep failing in this run are skipped for the rest of it
+        host_failures = defaultdict(int)
+        
+        # Unverified feed URLs are guesses such as /feed or /sitemap.xml; a 404 there says nothing about the host
+        def is_probe(job):
+            return 'feed' in job and not job['feed'].is_verified
+        
+        def fetch(job):
+            if host_failures[host_for(job['url'])] >= self.breaker_threshold:
+                if is_probe(job):
+                    # Skipped rather than failed, so the candidate is kept and tried next run
+                    return {'updates': [], 'page': None, 'skipped': 'host failing', 'elapsed': None, 'error': None}
+                return {
+                    'updates': [], 'page': None, 'skipped': None, 'elapsed': None,
+                    'error': 'Circuit open for host in this run',
+                }
+            if 'feed' in job:
+                return self.fetch_feed(job['feed'], job['fetch_state'])
+            return self.fetch_competitor(
+                job['competitor'], job['fetch_state'], job['rule'],
+                parse=parse_pool is None, discover=job['discover']
+            )
+        
+        def hand_off(job, result):
+            if result and result['error'] is not None and not is_probe(job):
+                host_failures[host_for(job['url'])] += 1
+            page = result['page'] if result else None
+            if parse_pool is not None and 'feed' not in job and page and page['changed']:
+                parse_futures[job['key']] = parse_pool.submit(
+                    parse_page_task, job['url'], page['content'], self.rule_spec(job['rule'])
+                )
+        
+        try:
+            results = scheduler.run(jobs, fetch, on_result=hand_off)
+            for key, future in parse_futures.items():
+                try:
+                    results[key]['updates'] = future.result()
+                except Exception as e:
+                    logger.error(f"Error parsing {results[key]['page']['url']}: {str(e)}")
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+        
+        failed = {'updates': [], 'page': None, 'skipped': None, 'elapsed': None, 'error': 'Fetch failed'}
+        new_updates = []
+        fetched_states = []
+        checked_configs = []
+        
+        for competitor in due:
+            config = configs[competitor.pk]
+            try:
+                feed_results = []
+                feed_updates = []
+                for feed in feeds[competitor.pk]:
+                    result = results.get(('feed', feed.pk)) or failed
+                    if self.update_fetch_state(fetch_states[feed.url], result['page']):
+                        fetched_states.append(fetch_states[feed.url])
+                    if self.save_feed_result(feed, result):
+                        feed_results.append(result)
+                        feed_updates.extend(result['updates'])
+                
+                snapshot = None
+                if competitor.pk in scraped:
+                    result = results.get(competitor.pk) or failed
+                    snapshot = self.store_snapshot(result['page'])
+                    if self.update_fetch_state(fetch_states[competitor.website], result['page'], snapshot):
+                        fetched_states.append(fetch_states[competitor.website])
+                    if result.get('feed_links') is not None:
+                        self.add_feed_candidates(competitor, result['feed_links'])
+                        config.feeds_discovered_at = timezone.now()
+                else:
+                    result = self.feed_outcome(feed_results)
+                
+                self.record_fetch_outcome(config, result)
+                checked_configs.append(config)
+                if result['error'] is not None:
+                    # Failed fetches stay due, so they are retried once the breaker allows it
+                    continue
+                new_updates.extend(self.build_updates(
+                    competitor,
+                    [
+                        (self.apply_keywords(config, feed_updates), None),
+                        (self.apply_keywords(config, result['updates']), snapshot),
+                    ],
+                    config.near_duplicate_threshold
+                ))
+                config.last_checked = timezone.now()
             except Exception as e:
                 logger.error(f"Error checking competitor {competitor.name}: {str(e)}")
         
-        # Create notifications for high-impact updates
-        for update in all_new_updates:
-            if update.is_high_impact:
-                self.create_notifications(update)
+        # Updates are written before check times, so a failed write is simply retried next run
+        all_new_updates = self.persist_updates(new_updates)
+        self.save_fetch_states(fetched_states)
+        self.save_configs(checked_configs)
         
         return all_new_updates
     
+    
     def create_notifications(self, update):
         """Create notifications for all users about high-impact updates"""
+        return self.notify_updates([update])
+    
+    def recipient_ids(self, competitor_id, recipients=None):
+        """Return a queryset of the ids of the users to notify about a competitor"""
         from django.contrib.auth.models import User
-        users = User.objects.all()
+        recipients = recipients or self.notify_recipients
+        users = User.objects.order_by()
+        if recipients in ('active', 'subscribed'):
+            users = users.filter(is_active=True)
+        if recipients == 'subscribed':
+            users = users.filter(subscribed_competitors=competitor_id)
+        return users.values_list('id', flat=True)
+    
+    def notify_updates(self, updates, recipients=None, digest_minutes=None):
+        """
+        Notify users about high-impact updates and return the number of notifications written.
+
+        Recipient ids are streamed once per competitor rather than loading
+        users, and notifications are inserted with chunked bulk_create in a
+        single transaction, so a run's fan-out either lands completely or not
+        at all. recipients is 'all', 'active' or 'subscribed' and defaults to
+        the MONITOR_NOTIFY_RECIPIENTS setting. With a digest window, each user
+        gets one notification per window instead of one per update.
+        """
+        by_competitor = defaultdict(list)
+        for update in updates:
+            by_competitor[update.competitor_id].append(update)
         
-        for user in users:
-            Notification.objects.create(
-                user=user,
-                update=update,
-                message=f"High-impact update from {update.competitor.name}: {update.title}"
-            )
+        digest_minutes = self.digest_minutes if digest_minutes is None else digest_minutes
+        if digest_minutes and by_competitor:
+            return self.notify_digests(by_competitor, recipients, digest_minutes)
+        
+        created = 0
+        chunk = []
+        with transaction.atomic():
+            for competitor_id, competitor_updates in by_competitor.items():
+                user_ids = self.recipient_ids(competitor_id, recipients)
+                for user_id in user_ids.iterator(chunk_size=self.notification_chunk_size):
+                    for update in competitor_updates:
+                        chunk.append(Notification(
+                            user_id=user_id,
+                            update=update,
+                            message=f"High-impact update from {update.competitor.name}: {update.title}"
+                        ))
+                    if len(chunk) >= self.notification_chunk_size:
+                        created += self.create_notification_chunk(chunk)
+                        chunk = []
+            if chunk:
+                created += self.create_notification_chunk(chunk)
+        return created
+    
+    def create_notification_chunk(self, notifications):
+        """Insert notifications and add them to their users' unread counters"""
+        Notification.objects.bulk_create(notifications)
+        counts = defaultdict(int)
+        for notification in notifications:
+            counts[notification.user_id] += 1
+        UnreadNotificationCounter.increment(counts)
+        self.publish_notifications(notifications)
+        return len(notifications)
+    
+    def publish_notifications(self, notifications, created=True):
+        """Push notifications to their users' live streams once the surrounding transaction commits"""
+        messages = [
+            (user_channel(notification.user_id), dict(notification.to_event(), created=created))
+            for notification in notifications
+        ]
+        if messages:
+            transaction.on_commit(lambda: get_broker().publish_many(messages))
+    
+    def digest_window(self, minutes, now=None):
+        """Return the start of the digest window that now falls in"""
+        now = now or timezone.now()
+        seconds = minutes * 60
+        return datetime.fromtimestamp(now.timestamp() // seconds * seconds, tz=dt_timezone.utc)
+    
+    def digest_message(self, updates):
+        lead = updates[0]
+        if len(updates) == 1:
+            return f"High-impact update from {lead.competitor.name}: {lead.title}"
+        names = ', '.join(dict.fromkeys(update.competitor.name for update in updates))
+        return f"{len(updates)} high-impact updates from {names}: {lead.title} and {len(updates) - 1} more"
+    
+    def notify_digests(self, by_competitor, recipients, minutes):
+        """
+        Add updates to each recipient's digest for the current window.
+
+        Users with the same set of updates share one digest content, so a
+        window's digests are written with one bulk_create per chunk of new
+        users and one UPDATE per distinct content for users who already have
+        an unread digest for the window.
+        """
+        window_start = self.digest_window(minutes)
+        
+        # user id -> ids of the updates they should hear about, in competitor order
+        user_updates = defaultdict(list)
+        for competitor_id, competitor_updates in by_competitor.items():
+            ids = [update.pk for update in competitor_updates]
+            user_ids = self.recipient_ids(competitor_id, recipients)
+            for user_id in user_ids.iterator(chunk_size=self.notification_chunk_size):
+                user_updates[user_id].extend(ids)
+        
+        updates = {
+            update.pk: update
+            for competitor_updates in by_competitor.values() for update in competitor_updates
+        }
+        written = 0
+        with transaction.atomic():
+            user_ids = list(user_updates)
+            for start in range(0, len(user_ids), self.notification_chunk_size):
+                chunk = user_ids[start:start + self.notification_chunk_size]
+                existing = {
+                    digest.user_id: digest
+                    for digest in Notification.objects.filter(
+                        user_id__in=chunk, is_digest=True, window_start=window_start, is_read=False
+                    ).only('id', 'user_id', 'is_digest', 'update_ids', 'created_at')
+                }
+                
+                new_digests = []
+                merged = defaultdict(list)
+                for user_id in chunk:
+                    digest = existing.get(user_id)
+                    if digest is None:
+                        new_digests.append(self.build_digest(user_id, user_updates[user_id], updates, window_start))
+                    else:
+                        ids = tuple(dict.fromkeys(digest.update_ids + user_updates[user_id]))
+                        if len(ids) > len(digest.update_ids):
+                            merged[ids].append(digest)
+                
+                written += self.create_notification_chunk(new_digests)
+                
+                missing = {pk for ids in merged for pk in ids if pk not in updates}
+                updates.update(CompetitorUpdate.objects.select_related('competitor').in_bulk(missing))
+                for ids, digests in merged.items():
+                    template = self.build_digest(None, list(ids), updates, window_start)
+                    Notification.objects.filter(pk__in=[digest.pk for digest in digests]).update(
+                        update=template.update, update_ids=template.update_ids, message=template.message
+                    )
+                    for digest in digests:
+                        digest.update = template.update
+                        digest.update_ids = template.update_ids
+                        digest.message = template.message
+                    self.publish_notifications(digests, created=False)
+                    written += len(digests)
+        return written
+    
+    def build_digest(self, user_id, update_ids, updates, window_start):
+        """Return an unsaved digest notification for the given updates, led by the most important one"""
+        digest_updates = [updates[pk] for pk in dict.fromkeys(update_ids) if pk in updates]
+        digest_updates.sort(key=lambda update: update.impact_score, reverse=True)
+        return Notification(
+            user_id=user_id,
+            update=digest_updates[0],
+            message=self.digest_message(digest_updates),
+            is_digest=True,
+            window_start=window_start,
+            update_ids=[update.pk for update in digest_updates],
+        )
 
 
 class TrendAnalyzer:
     """Analyzes trends and patterns in competitor updates"""
     
+    def __init__(self):
+        self.spike_window_days = getattr(settings, 'MONITOR_SPIKE_WINDOW_DAYS', 1)
+        self.spike_baseline_days = getattr(settings, 'MONITOR_SPIKE_BASELINE_DAYS', 28)
+        self.spike_significance = getattr(settings, 'MONITOR_SPIKE_SIGNIFICANCE', 0.01)
+        self.spike_max_trends = getattr(settings, 'MONITOR_SPIKE_MAX_TRENDS', 20)
+    
+    def window_start(self, days, now=None):
+        """Return the first day of an N-day window ending today, and the moment it starts"""
+        first_day = timezone.localdate(now) - timedelta(days=days)
+        return first_day, timezone.make_aware(datetime.combine(first_day, datetime.min.time()))
+    
     def detect_trends(self, days=30):
-        """Detect trends in the last N days"""
-        cutoff_date = timezone.now() - timedelta(days=days)
+        """
+        Detect trends in the last N days.
+
+        Counts come from the daily rollup, so they cost one row per day and
+        group however many updates the window holds. The window covers whole
+        days, starting at midnight N days ago.
+        """
+        first_day, cutoff_date = self.window_start(days)
         recent_updates = CompetitorUpdate.objects.filter(detected_at__gte=cutoff_date)
+        rollup = DailyUpdateRollup.objects.filter(day__gte=first_day).order_by()
         
         trends = []
         
         # Detect trends by update type
-        type_counts = recent_updates.values('update_type').annotate(
-            count=Count('id')
+        type_counts = rollup.values('update_type').annotate(
+            count=Sum('count')
         ).filter(count__gte=3)
         
         for item in type_counts:
@@ -224,12 +1023,12 @@ class TrendAnalyzer:
                 trend.last_detected = timezone.now()
                 trend.save()
             
-            trend.related_updates.set(related_updates)
+            trend.sync_related_updates(related_updates, cutoff_date)
             trends.append(trend)
         
         # Detect competitor-specific trends
-        competitor_counts = recent_updates.values('competitor__name').annotate(
-            count=Count('id')
+        competitor_counts = rollup.values('competitor__name').annotate(
+            count=Sum('count')
         ).filter(count__gte=5)
         
         for item in competitor_counts:
@@ -251,9 +1050,75 @@ class TrendAnalyzer:
                 trend.last_detected = timezone.now()
                 trend.save()
             
-            trend.related_updates.set(related_updates)
+            trend.sync_related_updates(related_updates, cutoff_date)
             trends.append(trend)
         
         return trends
+    
+    def detect_spikes(self, now=None):
+        """
+        Record statistically unusual activity in the last few days as trends.
 
-
+        Builds a daily series for every competitor and update type, plus
+        totals per type and per competitor, from the rollup, and scores them
+        all at once with trend_engine.detect_spikes. The most significant
+        spikes each update a trend whose confidence is the share of the
+        spike's updates above the expected count; the corrected p-value is
+        kept in the description.
+        """
+        today = timezone.localdate(now)
+        first_day = today - timedelta(days=self.spike_baseline_days + self.spike_window_days - 1)
+        rows = DailyUpdateRollup.objects.filter(day__gte=first_day, day__lte=today).order_by().values_list(
+            'day', 'competitor_id', 'update_type', 'count'
+        )
+        started = time.perf_counter()
+        series = SeriesSet.from_rows(rows, first_day, today).with_totals()
+        spikes = detect_spikes(
+            series, window=self.spike_window_days, baseline_days=self.spike_baseline_days,
+            significance=self.spike_significance
+        )[:self.spike_max_trends]
+        logger.debug(f"Scored {len(series.keys)} series for spikes in {time.perf_counter() - started:.3f}s")
+        if not spikes:
+            return []
+        
+        names = dict(Competitor.objects.filter(
+            pk__in={spike.competitor_id for spike in spikes if spike.competitor_id is not None}
+        ).values_list('pk', 'name'))
+        _, window_start = self.window_start(self.spike_window_days - 1, now)
+        period = 'today' if self.spike_window_days == 1 else f"in the last {self.spike_window_days} days"
+        
+        trends = []
+        for spike in spikes:
+            members = CompetitorUpdate.objects.filter(detected_at__gte=window_start)
+            if spike.competitor_id is not None:
+                members = members.filter(competitor_id=spike.competitor_id)
+            if spike.update_type is not None:
+                members = members.filter(update_type=spike.update_type)
+            
+            competitor = names.get(spike.competitor_id, '')
+            if spike.competitor_id is None:
+                name = f"Spike in {spike.update_type} updates"
+                subject = f"{spike.observed} {spike.update_type} updates"
+            elif spike.update_type is None:
+                name = f"Spike in activity from {competitor}"
+                subject = f"{spike.observed} updates from {competitor}"
+            else:
+                name = f"Spike in {spike.update_type} updates from {competitor}"
+                subject = f"{spike.observed} {spike.update_type} updates from {competitor}"
+            
+            trend, _ = Trend.objects.update_or_create(
+                name=name,
+                defaults={
+                    'description': (
+                        f"{subject} {period}, against {spike.expected:.2f} expected from the previous "
+                        f"{self.spike_baseline_days} days (z = {spike.z_score:.1f}, p = {spike.p_value:.2g})"
+                    ),
+                    'trend_type': spike.update_type or 'competitor_activity',
+                    'frequency': spike.observed,
+                    'confidence_score': round(spike.confidence, 4),
+                }
+            )
+            trend.sync_related_updates(members, window_start)
+            trends.append(trend)
+        
+        return trends
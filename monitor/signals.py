@@ -0,0 +1,57 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .classification import invalidate_keyword_matcher
+from .extraction import invalidate_compiled_rule
+from .models import (
+    Competitor, CompetitorUpdate, DailyUpdateRollup, ExtractionRule, FetchState, MonitoringConfig, Notification,
+    UnreadNotificationCounter
+)
+
+
+@receiver([post_save, post_delete], sender=ExtractionRule)
+def extraction_rule_changed(sender, instance, **kwargs):
+    """Recompile a competitor's rule and re-parse its page on the next run"""
+    invalidate_compiled_rule(instance.competitor_id)
+    websites = Competitor.objects.filter(pk=instance.competitor_id).values('website')
+    FetchState.objects.filter(url__in=websites).update(content_hash='', etag='', last_modified='')
+
+
+@receiver([post_save, post_delete], sender=MonitoringConfig)
+def monitoring_config_changed(sender, instance, **kwargs):
+    """Recompile a competitor's watched keywords on their next use"""
+    invalidate_keyword_matcher(instance.pk)
+
+
+@receiver(post_save, sender=CompetitorUpdate)
+def competitor_update_saved(sender, instance, created, **kwargs):
+    """Count updates saved one at a time; bulk inserts record themselves"""
+    if created:
+        DailyUpdateRollup.record([instance])
+
+
+@receiver(pre_save, sender=Notification)
+def notification_saving(sender, instance, **kwargs):
+    """Remember whose unread notification the row was before the save, if it was unread"""
+    instance._unread_user_id = None
+    if instance.pk is not None:
+        instance._unread_user_id = Notification.objects.filter(pk=instance.pk, is_read=False).values_list(
+            'user_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, **kwargs):
+    """
+    Keep unread counters in step with notifications saved one at a time.
+
+    Covers create() and get_or_create() as well as read state or user edits in
+    the admin; bulk inserts and mark_read() use update() and count themselves.
+    """
+    before = getattr(instance, '_unread_user_id', None)
+    after = None if instance.is_read else instance.user_id
+    if before != after:
+        if before is not None:
+            UnreadNotificationCounter.decrement(before)
+        if after is not None:
+            UnreadNotificationCounter.increment({after: 1})
+
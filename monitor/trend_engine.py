@@ -0,0 +1,163 @@
+"""
+Vectorized spike detection over the daily update counts of every competitor and update type
+"""
+import numpy as np
+
+# Minimum expected daily count, as if one update had been seen somewhere in the baseline
+BASELINE_PRIOR = 1.0
+
+
+class SeriesSet:
+    """
+    Daily counts of many series as one (series x days) matrix.
+
+    keys[i] is the (competitor id, update type) of row i; totals over all
+    types use None as the type, and totals over all competitors use None
+    as the competitor id. parents[i] is the row of the competitor total
+    that row i belongs to, or -1.
+    """
+    
+    def __init__(self, keys, first_day, counts, parents=None):
+        self.keys = keys
+        self.first_day = first_day
+        self.counts = counts
+        self.parents = np.full(len(keys), -1, dtype=np.intp) if parents is None else parents
+    
+    @classmethod
+    def from_rows(cls, rows, first_day, last_day):
+        """Build the matrix from (day, competitor id, update type, count) rows, e.g. rollup rows"""
+        index = {}
+        series, days, values = [], [], []
+        for day, competitor_id, update_type, count in rows:
+            series.append(index.setdefault((competitor_id, update_type), len(index)))
+            days.append((day - first_day).days)
+            values.append(count)
+        
+        counts = np.zeros((len(index), (last_day - first_day).days + 1), dtype=np.int64)
+        if values:
+            np.add.at(counts, (np.array(series, dtype=np.intp), np.array(days, dtype=np.intp)), values)
+        return cls(list(index), first_day, counts)
+    
+    def with_totals(self):
+        """Return a copy with a total series per update type and per competitor appended"""
+        update_types = sorted({update_type for _, update_type in self.keys})
+        competitor_ids = sorted({competitor_id for competitor_id, _ in self.keys})
+        type_rows = {update_type: row for row, update_type in enumerate(update_types)}
+        competitor_rows = {competitor_id: row for row, competitor_id in enumerate(competitor_ids)}
+        
+        type_totals = np.zeros((len(update_types), self.counts.shape[1]), dtype=np.int64)
+        competitor_totals = np.zeros((len(competitor_ids), self.counts.shape[1]), dtype=np.int64)
+        np.add.at(type_totals, np.array([type_rows[key[1]] for key in self.keys], dtype=np.intp), self.counts)
+        np.add.at(competitor_totals, np.array([competitor_rows[key[0]] for key in self.keys], dtype=np.intp),
+                  self.counts)
+        
+        keys = (
+            list(self.keys)
+            + [(None, update_type) for update_type in update_types]
+            + [(competitor_id, None) for competitor_id in competitor_ids]
+        )
+        first_total = len(self.keys) + len(update_types)
+        parents = np.concatenate([
+            np.array([first_total + competitor_rows[key[0]] for key in self.keys], dtype=np.intp),
+            np.full(len(update_types) + len(competitor_ids), -1, dtype=np.intp),
+        ])
+        return SeriesSet(keys, self.first_day, np.vstack([self.counts, type_totals, competitor_totals]), parents)
+
+
+class Spike:
+    """A series whose recent count is improbably high given its own history"""
+    
+    def __init__(self, key, observed, expected, z_score, p_value):
+        self.competitor_id, self.update_type = key
+        self.observed = int(observed)
+        self.expected = float(expected)
+        self.z_score = float(z_score)
+        self.p_value = float(p_value)
+    
+    @property
+    def confidence(self):
+        """
+        Share of the observed count that the baseline doesn't explain, from 0 to 1.
+
+        Every spike already passed the significance test, so 1 - p would be
+        about 1 for all of them; the excess share still tells a doubling
+        apart from a tenfold jump.
+        """
+        return max(0.0, 1.0 - self.expected / self.observed) if self.observed else 0.0
+    
+    def __repr__(self):
+        return (
+            f"Spike({self.competitor_id}, {self.update_type}: {self.observed} vs {self.expected:.1f} expected, "
+            f"z={self.z_score:.1f}, p={self.p_value:.2g})"
+        )
+
+
+def ewma_weights(length, halflife):
+    """Return normalized weights for `length` observations, oldest first, halving every `halflife` days"""
+    weights = 0.5 ** (np.arange(length - 1, -1, -1) / halflife)
+    return weights / weights.sum()
+
+
+def poisson_sf(observed, expected):
+    """
+    Return P(X >= observed) for X ~ Poisson(expected), elementwise.
+
+    Sums the probability mass below each observed count in log space, using
+    a single table of log k! shared by every series.
+    """
+    observed = np.asarray(observed, dtype=np.int64)
+    expected = np.asarray(expected, dtype=np.float64)
+    if observed.size == 0:
+        return np.zeros(0)
+    
+    k = np.arange(max(int(observed.max()), 1))
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, len(k))))))
+    log_pmf = k * np.log(expected)[:, None] - expected[:, None] - log_factorial
+    below = np.where(k < observed[:, None], np.exp(log_pmf), 0.0).sum(axis=1)
+    return np.clip(1.0 - below, 0.0, 1.0)
+
+
+def detect_spikes(series, window=1, baseline_days=28, halflife=7.0, min_count=3, z_threshold=3.0,
+                  significance=0.01):
+    """
+    Find the series whose last `window` days are a spike against their EWMA baseline.
+
+    Every series is scored at once: the baseline is the exponentially
+    weighted mean and variance of the `baseline_days` before the window,
+    the z-score uses at least the Poisson variance, and series that pass the
+    z and min_count thresholds get an exact Poisson tail probability. With
+    thousands of series some would look unusual by chance, so p-values are
+    Bonferroni-corrected for the number of series scored. A spike needs both
+    z >= z_threshold and p <= significance; its confidence is the share of
+    its observed count above the expected one. Series with no activity in
+    the baseline, and no activity from their competitor either, have no
+    history to compare with and are skipped. Returns spikes,
+    most significant first.
+    """
+    counts = series.counts
+    if counts.shape[0] == 0 or counts.shape[1] < window + 2:
+        return []
+    baseline = counts[:, -(window + baseline_days):-window].astype(np.float64)
+    observed = counts[:, -window:].sum(axis=1)
+    
+    weights = ewma_weights(baseline.shape[1], halflife)
+    mean = baseline @ weights
+    variance = (baseline - mean[:, None]) ** 2 @ weights
+    rate = np.maximum(mean, BASELINE_PRIOR / baseline.shape[1])
+    expected = rate * window
+    z_scores = (observed - expected) / np.sqrt(np.maximum(variance, rate) * window)
+    
+    has_history = baseline.any(axis=1)
+    parents = series.parents
+    has_history[parents >= 0] |= has_history[parents[parents >= 0]]
+    
+    candidates = np.flatnonzero(has_history & (observed >= min_count) & (z_scores >= z_threshold))
+    p_values = np.minimum(poisson_sf(observed[candidates], expected[candidates]) * len(counts), 1.0)
+    
+    spikes = [
+        Spike(series.keys[row], observed[row], expected[row], z_scores[row], p_value)
+        for row, p_value in zip(candidates, p_values)
+        if p_value <= significance
+    ]
+    spikes.sort(key=lambda spike: (spike.p_value, -spike.z_score))
+    return spikes
@@ -10,11 +10,13 @@ urlpatterns = [
     path('competitors/add/', views.add_competitor, name='add_competitor'),
     path('competitors/<int:pk>/', views.competitor_detail, name='competitor_detail'),
     path('competitors/<int:pk>/config/', views.monitoring_config, name='monitoring_config'),
+    path('competitors/<int:pk>/subscribe/', views.toggle_subscription, name='toggle_subscription'),
     path('updates/', views.updates_list, name='updates'),
     path('updates/<int:pk>/', views.update_detail, name='update_detail'),
     path('trends/', views.trends_list, name='trends'),
     path('notifications/', views.notifications_list, name='notifications'),
     path('notifications/<int:pk>/read/', views.mark_notification_read, name='mark_notification_read'),
+    path('notifications/stream/', views.notification_stream, name='notification_stream'),
     path('monitor/run/', views.run_monitoring, name='run_monitoring'),
 ]
 
@@ -1,14 +1,27 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, logout, authenticate
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
+from django.db import transaction
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
-from .models import Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig, UpdateType
+from .models import (
+    Competitor, CompetitorUpdate, Trend, Notification, MonitoringConfig, UpdateType, UnreadNotificationCounter
+)
 from .services import CompetitorMonitor, TrendAnalyzer
 from .forms import CompetitorForm, MonitoringConfigForm, SignUpForm
+from .pubsub import get_broker, user_channel
+
+# Reconnect delay suggested to EventSource clients, and how many missed notifications a reconnect replays
+STREAM_RETRY_MS = 5000
+STREAM_CATCH_UP_LIMIT = 50
 
 
 def dashboard(request):
@@ -35,7 +48,7 @@ def dashboard(request):
         unread_notifications = Notification.objects.filter(
             user=request.user, 
             is_read=False
-        )[:5]
+        ).select_related('update__competitor')[:5]
     
     # Updates in last 7 days
     week_ago = timezone.now() - timedelta(days=7)
@@ -70,14 +83,33 @@ def competitor_detail(request, pk):
     updates = competitor.updates.all()[:20]
     config = MonitoringConfig.objects.filter(competitor=competitor).first()
     
+    is_subscribed = (
+        request.user.is_authenticated and competitor.subscribers.filter(pk=request.user.pk).exists()
+    )
+    
     context = {
         'competitor': competitor,
         'updates': updates,
         'config': config,
+        'is_subscribed': is_subscribed,
     }
     return render(request, 'monitor/competitor_detail.html', context)
 
 
+@login_required
+def toggle_subscription(request, pk):
+    """Subscribe to or unsubscribe from a competitor's high-impact notifications"""
+    competitor = get_object_or_404(Competitor, pk=pk)
+    if request.method == 'POST':
+        if competitor.subscribers.filter(pk=request.user.pk).exists():
+            competitor.subscribers.remove(request.user)
+            messages.success(request, f'Unsubscribed from {competitor.name}.')
+        else:
+            competitor.subscribers.add(request.user)
+            messages.success(request, f'Subscribed to {competitor.name}.')
+    return redirect('competitor_detail', pk=competitor.pk)
+
+
 @login_required
 def add_competitor(request):
     """Add a new competitor"""
@@ -154,6 +186,7 @@ def trends_list(request):
     if request.GET.get('analyze') == 'true' and request.user.is_authenticated:
         analyzer = TrendAnalyzer()
         analyzer.detect_trends()
+        analyzer.detect_spikes()
         messages.success(request, 'Trend analysis completed!')
         return redirect('trends')
     
@@ -170,11 +203,14 @@ def notifications_list(request):
     
     # Mark as read if requested
     if request.GET.get('mark_read') == 'all':
-        notifications.update(is_read=True)
+        with transaction.atomic():
+            marked = notifications.filter(is_read=False).update(is_read=True)
+            UnreadNotificationCounter.decrement(request.user.pk, marked)
         messages.success(request, 'All notifications marked as read!')
         return redirect('notifications')
     
-    unread_count = notifications.filter(is_read=False).count()
+    unread_count = UnreadNotificationCounter.count_for(request.user)
+    notifications = Notification.attach_updates(notifications.select_related('update__competitor'))
     
     context = {
         'notifications': notifications,
@@ -187,12 +223,67 @@ def notifications_list(request):
 def mark_notification_read(request, pk):
     """Mark a notification as read"""
     notification = get_object_or_404(Notification, pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
+    notification.mark_read()
     messages.success(request, 'Notification marked as read!')
     return redirect('notifications')
 
 
+def sse_event(data, event='notification', event_id=None):
+    """Format one Server-Sent Events message"""
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def notification_events(user_id, last_id, heartbeat):
+    """
+    Yield a user's new notifications as Server-Sent Events.
+
+    Subscribes before catching up on unread notifications newer than
+    last_id, so nothing published in between is missed. Waiting costs no
+    thread; a comment line is sent every `heartbeat` seconds so proxies
+    keep the connection open. If the client falls too far behind, the
+    stream ends and the browser reconnects with its Last-Event-ID.
+    """
+    with get_broker().subscribe(user_channel(user_id)) as subscription:
+        yield f'retry: {STREAM_RETRY_MS}\n\n'
+        if last_id is not None:
+            missed = Notification.objects.filter(user_id=user_id, is_read=False, pk__gt=last_id).order_by('pk')
+            async for notification in missed[:STREAM_CATCH_UP_LIMIT]:
+                yield sse_event(dict(notification.to_event(), created=True), event_id=notification.pk)
+        
+        while not subscription.overflowed:
+            try:
+                message = await subscription.get(timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            yield sse_event(message, event_id=message['id'])
+
+
+async def notification_stream(request):
+    """Stream the signed-in user's new notifications as Server-Sent Events; needs an ASGI server"""
+    user = await sync_to_async(lambda: request.user if request.user.is_authenticated else None)()
+    if user is None:
+        return HttpResponse('Authentication required', status=401, content_type='text/plain')
+    
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_id')
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        last_id = None
+    
+    heartbeat = getattr(settings, 'MONITOR_STREAM_HEARTBEAT_SECONDS', 20)
+    response = StreamingHttpResponse(
+        notification_events(user.pk, last_id, heartbeat), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 def run_monitoring(request):
     """Manually trigger competitor monitoring"""
     if not request.user.is_authenticated:
@@ -0,0 +1,49 @@
+"""
+Worker processes for CPU-bound parsing and classification
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_monitor = None
+
+
+def init_worker():
+    """Set up Django in a freshly spawned worker process"""
+    import django
+    from django.apps import apps
+    
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'competitor_monitor.settings')
+    if not apps.ready:
+        django.setup()
+
+
+def create_pool(max_workers):
+    """
+    Create a process pool whose workers have Django set up.
+
+    Workers are spawned rather than forked, because monitoring runs start the
+    pool from processes that already run crawl or web server threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker,
+    )
+
+
+def parse_page_task(base_url, content, rule_spec):
+    """Parse and classify one raw page body, returning compact update records"""
+    global _monitor
+    if _monitor is None:
+        from .services import CompetitorMonitor
+        _monitor = CompetitorMonitor(parse_workers=0)
+    return _monitor.parse_page(base_url, content, rule_spec)
+
+
+def classify_updates_task(titles, contents):
+    """Classify updates one by one, returning plain lists of update types and impact scores"""
+    from .classification import classify
+    
+    results = [classify(title, content) for title, content in zip(titles, contents)]
+    return [str(update_type) for update_type, _ in results], [impact_score for _, impact_score in results]